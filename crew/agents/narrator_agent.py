@@ -17,6 +17,22 @@ class NarratorAgent:
             print(f"{k}: {v}")
         return summary
 
+    def generate_narrative(self, df):
+        lines = [
+            "Reconciliation Narrative Report",
+            "=" * 32,
+            f"Total trades analyzed: {len(df)}",
+        ]
+        for label, col in (("PV mismatches", "PV_Mismatch"),
+                           ("Delta mismatches", "Delta_Mismatch"),
+                           ("Flagged trades", "Any_Mismatch")):
+            if col in df.columns:
+                lines.append(f"{label}: {int(df[col].sum())}")
+        if "Any_Mismatch" in df.columns and len(df) > 0:
+            rate = df["Any_Mismatch"].sum() / len(df) * 100
+            lines.append(f"Mismatch rate: {rate:.1f}%")
+        return "\n".join(lines) + "\n"
+
     def save_report(self, df, output_path="final_recon_report.xlsx"):
         cols = [
             "TradeID", "PV_old", "PV_new", "PV_Diff",
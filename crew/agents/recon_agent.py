@@ -1,15 +1,28 @@
+import numpy as np
+
 class ReconAgent:
     def __init__(self, pv_tolerance=1000, delta_tolerance=0.05):
         self.pv_tolerance = pv_tolerance
         self.delta_tolerance = delta_tolerance
 
     def add_diff_flags(self, df):
-        df["PV_Diff"] = df["PV_new"] - df["PV_old"]
-        df["Delta_Diff"] = df["Delta_new"] - df["Delta_old"]
+        # Work on the raw float64 buffers: one vectorized pass per column,
+        # instead of pandas-level arithmetic on possibly-object columns.
+        # NaNs (missing PV/Delta) compare False against the tolerances,
+        # which is what the old fillna(False) produced.
+        pv_old = df["PV_old"].to_numpy(dtype=np.float64)
+        pv_new = df["PV_new"].to_numpy(dtype=np.float64)
+        delta_old = df["Delta_old"].to_numpy(dtype=np.float64)
+        delta_new = df["Delta_new"].to_numpy(dtype=np.float64)
 
-        df["PV_Mismatch"] = df["PV_Diff"].abs() > self.pv_tolerance
-        df["Delta_Mismatch"] = df["Delta_Diff"].abs() > self.delta_tolerance
+        pv_diff = pv_new - pv_old
+        delta_diff = delta_new - delta_old
+        pv_mismatch = np.abs(pv_diff) > self.pv_tolerance
+        delta_mismatch = np.abs(delta_diff) > self.delta_tolerance
 
-        # Use fillna to handle NaN values before boolean operations
-        df["Any_Mismatch"] = df["PV_Mismatch"].fillna(False) | df["Delta_Mismatch"].fillna(False)
+        df["PV_Diff"] = pv_diff
+        df["Delta_Diff"] = delta_diff
+        df["PV_Mismatch"] = pv_mismatch
+        df["Delta_Mismatch"] = delta_mismatch
+        df["Any_Mismatch"] = pv_mismatch | delta_mismatch
         return df
@@ -28,10 +28,17 @@ class UnifiedDataLoaderAgent:
         self.api_config = api_config or {}
         self.auto_fallback = auto_fallback
         
-        # Initialize API session if config provided
+        # Initialize API session if config provided; one session (with a
+        # sized keep-alive pool) is shared across every endpoint fetch so
+        # concurrent requests don't handshake per call
         self.session = None
         if api_config:
             self.session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=4, pool_maxsize=8
+            )
+            self.session.mount('http://', adapter)
+            self.session.mount('https://', adapter)
             if api_config.get('api_key'):
                 self.session.headers.update({
                     'Authorization': f"Bearer {api_config['api_key']}",
@@ -6,10 +6,15 @@ This script launches the Streamlit dashboard with optimized settings for develop
 and production environments.
 """
 
+import hashlib
 import os
 import sys
+import socket
 import subprocess
 import logging
+import threading
+import time
+import webbrowser
 from pathlib import Path
 
 # Configure logging
@@ -19,6 +24,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Launch command template; only the placeholders vary per run
+DASHBOARD_CMD_TEMPLATE = (
+    "{python}", "-m", "streamlit", "run", "app.py",
+    "--server.port", "{port}",
+    "--server.address", "localhost",
+    "--server.fileWatcherType", "{file_watcher_type}",
+    "--server.maxUploadSize", "200",
+    "--browser.gatherUsageStats", "false"
+)
+
 def check_dependencies():
     """Check if all required dependencies are installed."""
     required_packages = ['streamlit', 'pandas', 'plotly', 'openpyxl']
@@ -67,18 +82,20 @@ def check_data_files():
     logger.info("✅ All data files found")
     return True
 
-def setup_streamlit_config():
-    """Setup Streamlit configuration to avoid file watching issues."""
-    config_dir = Path(".streamlit")
-    config_file = config_dir / "config.toml"
-    
-    if not config_dir.exists():
-        config_dir.mkdir(exist_ok=True)
-        logger.info("📁 Created .streamlit/ directory")
-    
-    if not config_file.exists():
-        config_content = """[server]
-fileWatcherType = "auto"
+def get_file_watcher_type():
+    """File watcher type for the current environment.
+
+    Production launches (STREAMLIT_ENV=production) disable the watcher
+    entirely - the watchdog threads keep stat()ing the source tree, which
+    is pure overhead once the app is deployed.
+    """
+    if os.environ.get('STREAMLIT_ENV') == 'production':
+        return 'none'
+    return 'auto'
+
+# Streamlit config template; the watcher type is filled in per environment
+CONFIG_CONTENT_TEMPLATE = """[server]
+fileWatcherType = "{file_watcher_type}"
 fileWatcherExcludePatterns = [
     "**/__pycache__/**",
     "**/*.pyc",
@@ -100,8 +117,30 @@ backgroundColor = "#FFFFFF"
 secondaryBackgroundColor = "#F0F2F6"
 textColor = "#262730"
 """
-        config_file.write_text(config_content)
-        logger.info("📝 Created Streamlit configuration file")
+
+def setup_streamlit_config():
+    """Setup Streamlit configuration to avoid file watching issues."""
+    config_dir = Path(".streamlit")
+    config_file = config_dir / "config.toml"
+
+    if not config_dir.exists():
+        config_dir.mkdir(exist_ok=True)
+        logger.info("📁 Created .streamlit/ directory")
+
+    config_content = CONFIG_CONTENT_TEMPLATE.format(
+        file_watcher_type=get_file_watcher_type()
+    )
+
+    # Only touch the filesystem when the expected content actually changed
+    expected_hash = hashlib.sha256(config_content.encode()).digest()
+    try:
+        if hashlib.sha256(config_file.read_bytes()).digest() == expected_hash:
+            return
+    except FileNotFoundError:
+        pass
+
+    config_file.write_text(config_content)
+    logger.info("📝 Wrote Streamlit configuration file")
 
 def get_dashboard_port():
     """Get available dashboard port."""
@@ -122,6 +161,24 @@ def get_dashboard_port():
     
     return port
 
+def open_browser_when_ready(port, timeout=30.0):
+    """Open the browser as soon as the dashboard port accepts connections.
+
+    Run in a background thread started before Streamlit launches, so the
+    browser cold-start overlaps with Streamlit's import phase instead of
+    waiting for it.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('localhost', port), timeout=0.25):
+                pass
+        except OSError:
+            time.sleep(0.1)
+            continue
+        webbrowser.open(f"http://localhost:{port}")
+        return
+
 def launch_dashboard():
     """Launch the Streamlit dashboard with optimized settings."""
     try:
@@ -132,18 +189,16 @@ def launch_dashboard():
         port = get_dashboard_port()
         
         # Set environment variables for better performance
-        os.environ['STREAMLIT_SERVER_FILE_WATCHER_TYPE'] = 'auto'
+        file_watcher_type = get_file_watcher_type()
+        os.environ['STREAMLIT_SERVER_FILE_WATCHER_TYPE'] = file_watcher_type
         os.environ['STREAMLIT_SERVER_MAX_UPLOAD_SIZE'] = '200'
         os.environ['STREAMLIT_SERVER_HEADLESS'] = 'true'
-        
-        # Build command
+
+        # Build command from the shared template
         cmd = [
-            sys.executable, "-m", "streamlit", "run", "app.py",
-            "--server.port", str(port),
-            "--server.address", "localhost",
-            "--server.fileWatcherType", "auto",
-            "--server.maxUploadSize", "200",
-            "--browser.gatherUsageStats", "false"
+            arg.format(python=sys.executable, port=port,
+                       file_watcher_type=file_watcher_type)
+            for arg in DASHBOARD_CMD_TEMPLATE
         ]
         
         logger.info("🚀 Starting AI Reconciliation Dashboard...")
@@ -151,19 +206,42 @@ def launch_dashboard():
         logger.info(f"🔗 URL: http://localhost:{port}")
         logger.info("⏹️  Press Ctrl+C to stop the dashboard")
         logger.info("-" * 50)
-        
-        # Launch dashboard
-        subprocess.run(cmd, check=True)
-        
+
+        # Open the browser the instant the port accepts connections (the
+        # server runs headless, so Streamlit won't race us to open its own
+        # tab); started before the subprocess so browser startup overlaps
+        # Streamlit's import phase
+        threading.Thread(
+            target=open_browser_when_ready, args=(port,), daemon=True
+        ).start()
+
+        # Launch dashboard and stream its output
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1
+        )
+
+        try:
+            for line in process.stdout:
+                print(line, end='')
+
+            if process.wait() != 0:
+                logger.error(f"❌ Dashboard exited with code {process.returncode}")
+                return False
+        except KeyboardInterrupt:
+            process.terminate()
+            process.wait()
+            raise
+
     except KeyboardInterrupt:
         logger.info("\n🛑 Dashboard stopped by user")
-    except subprocess.CalledProcessError as e:
-        logger.error(f"❌ Failed to start dashboard: {e}")
-        return False
     except Exception as e:
         logger.error(f"❌ Unexpected error: {e}")
         return False
-    
+
     return True
 
 def main():
@@ -4,17 +4,30 @@ Data Service - Handles data loading, merging, and validation
 """
 
 from fastapi import FastAPI, HTTPException, UploadFile, File, Query
-from fastapi.responses import JSONResponse
-import pandas as pd
+from fastapi.concurrency import run_in_threadpool
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+import functools
+import json
 import os
 import tempfile
-from typing import Optional, List, Dict, Any
+import time
+import weakref
+from typing import Optional, List, Dict, Any, Tuple, TYPE_CHECKING
 import logging
 
-# Import unified data loader
+# Make crew.agents importable regardless of cwd; the absolute path is
+# inserted once so sys.path doesn't grow (and get re-stat'ed) on every
+# launch. The loader itself is imported lazily inside handlers so the
+# service reaches "listening" without paying the pandas/loader import cost.
 import sys
-sys.path.append('..')
-from crew.agents.unified_data_loader import UnifiedDataLoaderAgent
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -23,18 +36,77 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Data Service",
     description="Service for data loading, merging, and validation",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
+# Wide frames produce multi-KB validation payloads; compress the big ones
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+class APIConfig(BaseModel):
+    """API connection settings accepted by the load endpoints.
+
+    Declaring the schema lets FastAPI validate requests with a compiled
+    pydantic validator instead of treating the config as an opaque dict.
+    """
+    base_url: str
+    api_key: Optional[str] = None
+    timeout: float = 30
+    endpoints: Dict[str, str] = {}
+    headers: Dict[str, str] = {}
+
+# How long a cached file load stays valid (seconds); mtime changes always
+# invalidate regardless of age
+FILE_CACHE_TTL = 300.0
+
+# Resolved on first use so repeat requests skip the import machinery
+_unified_loader_cls = None
+
+def _get_unified_loader_cls():
+    """Import UnifiedDataLoaderAgent on first use and cache the class"""
+    global _unified_loader_cls
+    if _unified_loader_cls is None:
+        from crew.agents.unified_data_loader import UnifiedDataLoaderAgent
+        _unified_loader_cls = UnifiedDataLoaderAgent
+    return _unified_loader_cls
+
+@functools.lru_cache(maxsize=4)
+def _make_loader(data_dir, api_config_json):
+    """Build (or reuse) a loader for the given constructor args.
+
+    api_config is a dict, so it travels as a sorted JSON string to keep
+    the cache key hashable.
+    """
+    loader_cls = _get_unified_loader_cls()
+    api_config = json.loads(api_config_json) if api_config_json else None
+    return loader_cls(data_dir=data_dir, api_config=api_config)
+
 class DataService:
     def __init__(self):
         self.unified_loader = None
-    
-    def load_data(self, source: str = "auto", data_dir: str = None, api_config: Dict[str, Any] = None, 
-                  trade_ids: Optional[List[str]] = None, date: Optional[str] = None) -> pd.DataFrame:
+        # (data_dir, file mtimes) -> (monotonic timestamp, DataFrame)
+        self._file_cache: Dict[Tuple, Tuple[float, "pd.DataFrame"]] = {}
+        # id(df) -> (weakref to df, validation result) for frames we've seen
+        self._validation_cache: Dict[int, Tuple[Any, Dict[str, Any]]] = {}
+
+    def _file_cache_key(self, data_dir: str) -> Optional[Tuple]:
+        """Build a cache key from the directory and its Excel file mtimes"""
+        try:
+            with os.scandir(data_dir) as entries:
+                mtimes = tuple(sorted(
+                    (entry.name, entry.stat().st_mtime)
+                    for entry in entries if entry.name.endswith('.xlsx')
+                ))
+        except OSError:
+            return None
+        return (data_dir, mtimes)
+
+    def load_data(self, source: str = "auto", data_dir: str = None, api_config: Dict[str, Any] = None,
+                  trade_ids: Optional[List[str]] = None, date: Optional[str] = None) -> "pd.DataFrame":
         """Load data using unified loader"""
         try:
-            self.unified_loader = UnifiedDataLoaderAgent(data_dir=data_dir, api_config=api_config)
+            api_config_json = json.dumps(api_config, sort_keys=True) if api_config else None
+            self.unified_loader = _make_loader(data_dir, api_config_json)
             df = self.unified_loader.load_data(source, trade_ids, date)
             if df is None or df.empty:
                 raise ValueError(f"No data loaded from {source} source")
@@ -43,43 +115,69 @@ class DataService:
             logger.error(f"Error loading data from {source}: {e}")
             raise
     
-    def load_from_files(self, data_dir: str) -> pd.DataFrame:
-        """Load data from Excel files"""
-        return self.load_data(source="files", data_dir=data_dir)
+    def load_from_files(self, data_dir: str) -> "pd.DataFrame":
+        """Load data from Excel files, reusing a cached frame while unchanged"""
+        key = self._file_cache_key(data_dir)
+        if key is not None:
+            cached = self._file_cache.get(key)
+            if cached and time.monotonic() - cached[0] < FILE_CACHE_TTL:
+                logger.info(f"Returning cached file data for {data_dir}")
+                return cached[1]
+
+        df = self.load_data(source="files", data_dir=data_dir)
+        if key is not None:
+            now = time.monotonic()
+            self._file_cache = {
+                k: v for k, v in self._file_cache.items()
+                if now - v[0] < FILE_CACHE_TTL
+            }
+            self._file_cache[key] = (now, df)
+        return df
     
-    def load_from_api(self, api_config: Dict[str, Any], trade_ids: Optional[List[str]] = None, date: Optional[str] = None) -> pd.DataFrame:
+    def load_from_api(self, api_config: Dict[str, Any], trade_ids: Optional[List[str]] = None, date: Optional[str] = None) -> "pd.DataFrame":
         """Load data from API"""
         return self.load_data(source="api", api_config=api_config, trade_ids=trade_ids, date=date)
     
-    def load_hybrid(self, data_dir: str, api_config: Dict[str, Any], source: str = "auto", trade_ids: Optional[List[str]] = None, date: Optional[str] = None) -> pd.DataFrame:
+    def load_hybrid(self, data_dir: str, api_config: Dict[str, Any], source: str = "auto", trade_ids: Optional[List[str]] = None, date: Optional[str] = None) -> "pd.DataFrame":
         """Load data using hybrid approach"""
         return self.load_data(source=source, data_dir=data_dir, api_config=api_config, trade_ids=trade_ids, date=date)
     
-    def validate_data(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def validate_data(self, df: "pd.DataFrame") -> Dict[str, Any]:
         """Validate data quality and return summary"""
         try:
+            # Cache hits happen when a cached frame is re-validated (e.g.
+            # repeated /load/files); the weakref guards against id() reuse
+            cached = self._validation_cache.get(id(df))
+            if cached is not None and cached[0]() is df:
+                return cached[1]
+
             validation_result = {
                 "total_trades": len(df),
                 "columns": list(df.columns),
-                "missing_values": df.isnull().sum().to_dict(),
-                "data_types": df.dtypes.to_dict(),
+                "missing_values": (len(df) - df.count()).astype(int).to_dict(),
+                "data_types": {col: str(dtype) for col, dtype in df.dtypes.items()},
                 "validation_passed": True,
                 "issues": []
             }
             
-            # Check for required columns
+            # Check for required columns (set lookup avoids scanning the
+            # column Index once per required column)
             required_columns = ['TradeID', 'PV_old', 'PV_new', 'Delta_old', 'Delta_new']
-            missing_columns = [col for col in required_columns if col not in df.columns]
+            columns = set(df.columns)
+            missing_columns = [col for col in required_columns if col not in columns]
             if missing_columns:
                 validation_result["validation_passed"] = False
                 validation_result["issues"].append(f"Missing required columns: {missing_columns}")
             
             # Check for duplicate TradeIDs
-            if 'TradeID' in df.columns:
-                duplicates = df['TradeID'].duplicated().sum()
+            if 'TradeID' in columns:
+                duplicates = len(df) - df['TradeID'].nunique(dropna=False)
                 if duplicates > 0:
                     validation_result["issues"].append(f"Found {duplicates} duplicate TradeIDs")
-            
+
+            if len(self._validation_cache) >= 8:
+                self._validation_cache.clear()
+            self._validation_cache[id(df)] = (weakref.ref(df), validation_result)
             return validation_result
         except Exception as e:
             logger.error(f"Error validating data: {e}")
@@ -97,6 +195,32 @@ class DataService:
             return self.unified_loader.get_api_status()
         return {}
 
+# id(df) -> (weakref, data_ref) so cache-hit frames reuse their parquet
+# file instead of rewriting one per poll
+_ref_cache: Dict[int, Tuple[Any, str]] = {}
+
+def _store_shared_dataframe(df: "pd.DataFrame") -> str:
+    """Persist df for downstream services (imported lazily - pulls pandas)"""
+    from services import shared_data
+
+    cached = _ref_cache.get(id(df))
+    if (cached is not None and cached[0]() is df
+            and os.path.exists(cached[1])):
+        return cached[1]
+
+    data_ref = shared_data.store_dataframe(df, "load")
+    if len(_ref_cache) >= 8:
+        _ref_cache.clear()
+    _ref_cache[id(df)] = (weakref.ref(df), data_ref)
+    return data_ref
+
+def trim_validation(validation: Dict[str, Any], verbose: bool) -> Dict[str, Any]:
+    """Drop the per-column detail fields unless the caller asked for them"""
+    if verbose:
+        return validation
+    return {k: v for k, v in validation.items()
+            if k not in ('missing_values', 'data_types')}
+
 # Initialize service
 data_service = DataService()
 
@@ -106,16 +230,22 @@ async def health_check():
     return {"status": "healthy", "service": "data_service"}
 
 @app.post("/load/files")
-async def load_from_files(data_dir: str = Query(..., description="Directory containing Excel files")):
+async def load_from_files(
+    data_dir: str = Query(..., description="Directory containing Excel files"),
+    verbose: bool = Query(False, description="Include per-column missing-value and dtype detail")
+):
     """Load data from Excel files"""
     try:
-        df = data_service.load_from_files(data_dir)
-        validation = data_service.validate_data(df)
+        df = await run_in_threadpool(data_service.load_from_files, data_dir)
+        validation = await run_in_threadpool(data_service.validate_data, df)
         
+        data_ref = await run_in_threadpool(_store_shared_dataframe, df)
+
         return {
             "status": "success",
+            "data_ref": data_ref,
             "data_shape": df.shape,
-            "validation": validation,
+            "validation": trim_validation(validation, verbose),
             "message": f"Loaded {len(df)} trades from files"
         }
     except Exception as e:
@@ -123,19 +253,23 @@ async def load_from_files(data_dir: str = Query(..., description="Directory cont
 
 @app.post("/load/api")
 async def load_from_api(
-    api_config: Dict[str, Any],
+    api_config: APIConfig,
     trade_ids: Optional[List[str]] = None,
-    date: Optional[str] = None
+    date: Optional[str] = None,
+    verbose: bool = Query(False, description="Include per-column missing-value and dtype detail")
 ):
     """Load data from API"""
     try:
-        df = data_service.load_from_api(api_config, trade_ids, date)
-        validation = data_service.validate_data(df)
+        df = await run_in_threadpool(data_service.load_from_api, api_config.model_dump(), trade_ids, date)
+        validation = await run_in_threadpool(data_service.validate_data, df)
         
+        data_ref = await run_in_threadpool(_store_shared_dataframe, df)
+
         return {
             "status": "success",
+            "data_ref": data_ref,
             "data_shape": df.shape,
-            "validation": validation,
+            "validation": trim_validation(validation, verbose),
             "message": f"Loaded {len(df)} trades from API"
         }
     except Exception as e:
@@ -144,20 +278,26 @@ async def load_from_api(
 @app.post("/load/hybrid")
 async def load_hybrid(
     data_dir: str = Query(..., description="Directory for file fallback"),
-    api_config: Dict[str, Any] = None,
+    api_config: Optional[APIConfig] = None,
     source: str = Query("auto", description="Data source: files, api, auto, or hybrid"),
     trade_ids: Optional[List[str]] = None,
-    date: Optional[str] = None
+    date: Optional[str] = None,
+    verbose: bool = Query(False, description="Include per-column missing-value and dtype detail")
 ):
     """Load data using hybrid approach"""
     try:
-        df = data_service.load_hybrid(data_dir, api_config, source, trade_ids, date)
-        validation = data_service.validate_data(df)
+        df = await run_in_threadpool(data_service.load_hybrid, data_dir,
+                                     api_config.model_dump() if api_config else None,
+                                     source, trade_ids, date)
+        validation = await run_in_threadpool(data_service.validate_data, df)
         
+        data_ref = await run_in_threadpool(_store_shared_dataframe, df)
+
         return {
             "status": "success",
+            "data_ref": data_ref,
             "data_shape": df.shape,
-            "validation": validation,
+            "validation": trim_validation(validation, verbose),
             "source_used": source,
             "message": f"Loaded {len(df)} trades using {source} approach"
         }
@@ -165,15 +305,37 @@ async def load_hybrid(
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/validate")
-async def validate_data(data: Dict[str, Any]):
+async def validate_data(
+    data: Dict[str, Any],
+    orient: str = Query("records", description="Payload shape: 'records' (list of row dicts) or 'columns' (dict of column lists)"),
+    verbose: bool = Query(False, description="Include per-column missing-value and dtype detail")
+):
     """Validate data quality"""
+    if orient not in ("records", "columns"):
+        raise HTTPException(status_code=400, detail=f"Unsupported orient: {orient}")
+
+    # Reject empty payloads before paying for the pandas import or a
+    # DataFrame construction
+    payload = data.get("data")
+    if not payload:
+        raise HTTPException(status_code=422, detail="No data provided")
+
     try:
-        df = pd.DataFrame(data.get("data", []))
-        validation = data_service.validate_data(df)
+        import pandas as pd
+
+        if orient == "columns":
+            # Columnar payloads build one array per column instead of
+            # inspecting every row dict
+            df = await run_in_threadpool(pd.DataFrame.from_dict, payload)
+        else:
+            df = await run_in_threadpool(
+                pd.DataFrame.from_records, payload, columns=data.get("columns")
+            )
+        validation = await run_in_threadpool(data_service.validate_data, df)
         
         return {
             "status": "success",
-            "validation": validation
+            "validation": trim_validation(validation, verbose)
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -193,4 +355,9 @@ async def get_available_sources():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001) 
\ No newline at end of file
+    if os.environ.get("RECON_USE_UDS", "").lower() in ("1", "true", "yes"):
+        # Co-located deployments skip loopback TCP entirely
+        uds_dir = os.environ.get("RECON_UDS_DIR", "/tmp")
+        uvicorn.run(app, uds=os.path.join(uds_dir, "recon_data.sock"))
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=8001)
@@ -4,25 +4,121 @@ Orchestrator Service - Coordinates between all other services
 """
 
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 import pandas as pd
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import logging
+import hashlib
+import sys
+import uuid
+import orjson
+import os
 import httpx
 import asyncio
+import json
+import time
 from datetime import datetime
 
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+from services import shared_data
+
+try:
+    import zstandard
+except ImportError:  # optional; responses simply arrive uncompressed
+    zstandard = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Max in-flight requests per downstream service; sized to what a single
+# uvicorn worker handles comfortably, overridable per deployment
+SERVICE_CONCURRENCY = int(os.environ.get("RECON_SERVICE_CONCURRENCY", "16"))
+
+# Talk to co-located services over Unix domain sockets instead of
+# loopback TCP (skips the TCP state machine and checksums per call).
+# Each service must be started with RECON_USE_UDS=1 as well so it binds
+# its socket under RECON_UDS_DIR.
+USE_UDS = os.environ.get("RECON_USE_UDS", "").lower() in ("1", "true", "yes")
+UDS_DIR = os.environ.get("RECON_UDS_DIR", "/tmp")
+
+def uds_path(service_name: str) -> str:
+    return os.path.join(UDS_DIR, f"recon_{service_name}.sock")
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+def response_json(response: httpx.Response) -> Dict[str, Any]:
+    """response.json(), decoding zstd bodies httpx left compressed.
+
+    Recent httpx decodes zstd itself when zstandard is installed, in
+    which case .content is already plain - hence the magic-byte check
+    rather than trusting the content-encoding header alone.
+    """
+    if (response.headers.get("content-encoding") == "zstd"
+            and zstandard is not None
+            and response.content[:4] == ZSTD_MAGIC):
+        return orjson.loads(
+            zstandard.ZstdDecompressor().decompress(response.content)
+        )
+    return response.json()
+
 app = FastAPI(
     title="Orchestrator Service",
     description="Service that coordinates between all other services",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
+class CircuitBreaker:
+    """Failure tracker for one downstream endpoint.
+
+    CLOSED: calls pass through. After FAILURE_THRESHOLD consecutive
+    failures the breaker opens and calls short-circuit until COOLDOWN
+    has passed, after which the next call is allowed through as a probe
+    (half-open); its outcome closes or re-opens the breaker.
+    """
+    FAILURE_THRESHOLD = 3
+    COOLDOWN = 30.0
+
+    def __init__(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        return time.monotonic() - self.opened_at >= self.COOLDOWN
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.FAILURE_THRESHOLD:
+            self.opened_at = time.monotonic()
+
+class WorkflowStep:
+    """One node in the workflow DAG.
+
+    runner is an async callable returning a step fragment
+    ({"status": ..., "result"/"error": ...}); deps name the steps whose
+    completion it waits on. Critical steps abort the workflow on failure;
+    deferred steps run in the background after the response is returned.
+    """
+    def __init__(self, name, deps, runner, critical=False, deferred=False):
+        self.name = name
+        self.deps = deps
+        self.runner = runner
+        self.critical = critical
+        self.deferred = deferred
+
 class OrchestratorService:
+    # How long a per-service health result stays fresh (seconds)
+    HEALTH_CACHE_TTL = 10.0
+
     def __init__(self):
         self.service_urls = {
             "data": "http://localhost:8001",
@@ -30,30 +126,220 @@ class OrchestratorService:
             "ml": "http://localhost:8003",
             "report": "http://localhost:8004"
         }
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # One shared client for all downstream calls; keepalive pooling
+        # means repeat service hops reuse warm TCP connections instead of
+        # paying a handshake per request
+        client_kwargs = dict(
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            headers={"accept-encoding": "zstd, gzip"} if zstandard else None,
+            limits=httpx.Limits(
+                max_keepalive_connections=50,
+                max_connections=200,
+                keepalive_expiry=300
+            )
+        )
+        self.client = httpx.AsyncClient(**client_kwargs)
+        # Per-service UDS clients; the request URL keeps its host:port
+        # form (used only for the Host header), the transport connects
+        # to the socket
+        self._uds_clients: Dict[str, httpx.AsyncClient] = {}
+        if USE_UDS:
+            self._uds_clients = {
+                name: httpx.AsyncClient(
+                    transport=httpx.AsyncHTTPTransport(uds=uds_path(name)),
+                    **client_kwargs
+                )
+                for name in self.service_urls
+            }
+        # url -> (monotonic timestamp, health dict)
+        self._health_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # param-hash -> in-flight workflow task / recently completed result
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._recent_results: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # workflow_id -> live workflow state (shared dict, mutated by
+        # deferred steps as they finish)
+        self._workflow_state: Dict[str, Dict[str, Any]] = {}
+        # endpoint -> circuit breaker state and last good response
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._last_good: Dict[str, Dict[str, Any]] = {}
+        # Deferred-step tasks are held here until done - the event loop
+        # only keeps weak references to running tasks
+        self._deferred_tasks: set = set()
+        # Bound concurrent requests per downstream service so workflow
+        # bursts can't fan out unbounded load
+        self._semaphores = {
+            name: asyncio.Semaphore(SERVICE_CONCURRENCY)
+            for name in self.service_urls
+        }
+
+    def _client_for(self, service_name: str) -> httpx.AsyncClient:
+        """The transport to reach a service: its UDS client when enabled"""
+        return self._uds_clients.get(service_name, self.client)
+
+    async def _post_step(self, service_name: str, path: str, **kwargs) -> Dict[str, Any]:
+        """POST to a downstream service, guarded by its circuit breaker.
+
+        Returns a workflow step fragment: status plus result or error.
+        While an endpoint's breaker is open, the last good response is
+        served with stale=True instead of waiting out another timeout.
+        """
+        key = f"{service_name}{path}"
+        breaker = self._breakers.setdefault(key, CircuitBreaker())
+
+        if not breaker.allow():
+            stale = self._last_good.get(key)
+            if stale is not None:
+                return {"status": "completed", "stale": True, "result": stale}
+            return {"status": "failed", "error": f"{service_name} circuit open"}
+
+        try:
+            if "content" in kwargs:
+                # Pre-serialized JSON bytes shared across calls
+                kwargs.setdefault("headers", {"content-type": "application/json"})
+            async with self._semaphores[service_name]:
+                response = await self._client_for(service_name).post(
+                    f"{self.service_urls[service_name]}{path}", **kwargs
+                )
+        except Exception as e:
+            breaker.record_failure()
+            return {"status": "failed", "error": str(e)}
+
+        if response.status_code == 200:
+            breaker.record_success()
+            result = response_json(response)
+            self._last_good[key] = result
+            return {"status": "completed", "result": result}
+
+        breaker.record_failure()
+        return {"status": "failed", "error": response.text}
     
-    async def check_service_health(self) -> Dict[str, Any]:
-        """Check health of all services"""
+    async def check_service_health(self, fresh: bool = False) -> Dict[str, Any]:
+        """Check health of all services.
+
+        Results are cached for HEALTH_CACHE_TTL seconds so polling
+        consumers (dashboards, probes) don't fan out four HTTP calls per
+        hit; pass fresh=True to bypass the cache.
+        """
         health_status = {}
-        
+        now = time.monotonic()
+
+        to_probe = []
         for service_name, url in self.service_urls.items():
-            try:
-                response = await self.client.get(f"{url}/health")
-                health_status[service_name] = {
-                    "status": "healthy" if response.status_code == 200 else "unhealthy",
-                    "url": url,
-                    "response_time": response.elapsed.total_seconds()
-                }
-            except Exception as e:
-                health_status[service_name] = {
-                    "status": "unhealthy",
-                    "url": url,
-                    "error": str(e)
-                }
-        
+            if not fresh:
+                cached = self._health_cache.get(url)
+                if cached and now - cached[0] < self.HEALTH_CACHE_TTL:
+                    health_status[service_name] = cached[1]
+                    continue
+            to_probe.append((service_name, url))
+
+        if to_probe:
+            # The probes are independent I/O, so the total cost is the
+            # slowest service rather than the sum of all four
+            results = await asyncio.gather(
+                *[self._probe_health(name, url) for name, url in to_probe]
+            )
+            for service_name, status in results:
+                health_status[service_name] = status
+                self._health_cache[self.service_urls[service_name]] = (
+                    time.monotonic(), status
+                )
+
         return health_status
+
+    def _register_workflow(self, workflow_result: Dict[str, Any]):
+        """Track workflow state for polling, keeping the store bounded"""
+        if len(self._workflow_state) >= 32:
+            for stale_id in list(self._workflow_state)[:16]:
+                del self._workflow_state[stale_id]
+        self._workflow_state[workflow_result["workflow_id"]] = workflow_result
+
+    async def _run_dag(self, steps: List[WorkflowStep],
+                       workflow_result: Dict[str, Any],
+                       results: Dict[str, Dict[str, Any]]) -> Optional[str]:
+        """Topologically execute workflow steps.
+
+        Every step launches the moment the steps it depends on have
+        completed, so independent branches overlap without the schedule
+        being hard-coded. A step whose dependency failed is recorded as
+        skipped instead of running against missing data. Deferred steps
+        are detached to the background and land on the stored workflow
+        state. Returns an error summary if any critical step failed.
+        """
+        steps = list(steps)
+        done = {step.name: asyncio.Event() for step in steps}
+        scheduled = set(done)
+        critical_failures: List[str] = []
+
+        async def run_step(step: WorkflowStep) -> None:
+            for dep in step.deps:
+                if dep in scheduled:
+                    await done[dep].wait()
+            dep_failed = any(
+                results.get(dep, {}).get("status") != "completed"
+                for dep in step.deps if dep in scheduled
+            )
+            if dep_failed:
+                outcome = {"status": "skipped", "error": "dependency failed"}
+            else:
+                logger.info(f"Running workflow step: {step.name}")
+                outcome = await step.runner()
+            results[step.name] = outcome
+            workflow_result["steps"].append({"step": step.name, **outcome})
+            if step.critical and outcome["status"] != "completed":
+                critical_failures.append(
+                    f"{step.name}: {outcome.get('error', 'failed')}"
+                )
+            done[step.name].set()
+
+        deferred = [step for step in steps if step.deferred]
+        if deferred:
+            workflow_result["reports_deferred"] = True
+
+            async def run_deferred():
+                try:
+                    async with asyncio.TaskGroup() as tg:
+                        for step in deferred:
+                            tg.create_task(run_step(step))
+                except Exception as e:
+                    logger.error(f"Deferred steps failed: {e}")
+                    workflow_result.setdefault("error", f"deferred steps failed: {e}")
+                finally:
+                    # Pollers must see the flag drop even if a step blew up
+                    workflow_result["reports_deferred"] = False
+
+            task = asyncio.create_task(run_deferred())
+            self._deferred_tasks.add(task)
+            task.add_done_callback(self._deferred_tasks.discard)
+
+        # TaskGroup (3.11+) gives structured semantics: an unexpected
+        # exception in one step cancels its siblings immediately instead
+        # of letting them wait out their timeouts against the pool
+        async with asyncio.TaskGroup() as tg:
+            for step in steps:
+                if not step.deferred:
+                    tg.create_task(run_step(step))
+        return "; ".join(critical_failures) or None
+
+    async def _probe_health(self, service_name: str, url: str) -> Tuple[str, Dict[str, Any]]:
+        """Probe a single service's /health endpoint"""
+        try:
+            response = await self._client_for(service_name).get(f"{url}/health")
+            return service_name, {
+                "status": "healthy" if response.status_code == 200 else "unhealthy",
+                "url": url,
+                "response_time": response.elapsed.total_seconds()
+            }
+        except Exception as e:
+            return service_name, {
+                "status": "unhealthy",
+                "url": url,
+                "error": str(e)
+            }
     
-    async def run_full_reconciliation(self, 
+    # How long a completed workflow result answers identical requests
+    WORKFLOW_RESULT_TTL = 30.0
+
+    async def run_full_reconciliation(self,
                                    data_source: str = "files",
                                    data_dir: str = None,
                                    api_config: Dict[str, Any] = None,
@@ -62,121 +348,172 @@ class OrchestratorService:
                                    pv_tolerance: float = 1000,
                                    delta_tolerance: float = 0.05,
                                    train_ml: bool = True,
-                                   generate_reports: bool = True) -> Dict[str, Any]:
-        """Run the complete reconciliation workflow"""
+                                   generate_reports: bool = True,
+                                   defer_reports: bool = False) -> Dict[str, Any]:
+        """Run the complete reconciliation workflow.
+
+        Concurrent calls with identical parameters are coalesced onto one
+        in-flight pipeline, and a completed result answers identical
+        requests for WORKFLOW_RESULT_TTL seconds - retry storms and
+        dashboard bursts don't multiply work downstream.
+        """
+        params = {
+            "data_source": data_source,
+            "data_dir": data_dir,
+            "api_config": api_config,
+            "trade_ids": trade_ids,
+            "date": date,
+            "pv_tolerance": pv_tolerance,
+            "delta_tolerance": delta_tolerance,
+            "train_ml": train_ml,
+            "generate_reports": generate_reports,
+            "defer_reports": defer_reports
+        }
+        key = hashlib.blake2b(
+            json.dumps(params, sort_keys=True).encode(), digest_size=16
+        ).hexdigest()
+
+        cached = self._recent_results.get(key)
+        if cached and time.monotonic() - cached[0] < self.WORKFLOW_RESULT_TTL:
+            return cached[1]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            return await task
+
+        task = asyncio.create_task(self._run_workflow(**params))
+        self._inflight[key] = task
+        try:
+            result = await task
+        finally:
+            self._inflight.pop(key, None)
+
+        if result.get("status") == "completed":
+            now = time.monotonic()
+            self._recent_results = {
+                k: v for k, v in self._recent_results.items()
+                if now - v[0] < self.WORKFLOW_RESULT_TTL
+            }
+            self._recent_results[key] = (now, result)
+        return result
+
+    async def _run_workflow(self,
+                            data_source: str = "files",
+                            data_dir: str = None,
+                            api_config: Dict[str, Any] = None,
+                            trade_ids: List[str] = None,
+                            date: str = None,
+                            pv_tolerance: float = 1000,
+                            delta_tolerance: float = 0.05,
+                            train_ml: bool = True,
+                            generate_reports: bool = True,
+                            defer_reports: bool = False) -> Dict[str, Any]:
+        """Execute the workflow steps (no deduplication)"""
         try:
             workflow_result = {
-                "workflow_id": f"recon_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                "workflow_id": f"recon_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}",
                 "start_time": datetime.now().isoformat(),
                 "steps": [],
                 "results": {}
             }
-            
-            # Step 1: Load Data
-            logger.info("Step 1: Loading data...")
-            if data_source == "files":
-                response = await self.client.post(
-                    f"{self.service_urls['data']}/load/files",
-                    params={"data_dir": data_dir}
-                )
-            elif data_source == "api":
-                response = await self.client.post(
-                    f"{self.service_urls['data']}/load/api",
-                    json={"api_config": api_config, "trade_ids": trade_ids, "date": date}
-                )
-            else:  # hybrid
-                response = await self.client.post(
-                    f"{self.service_urls['data']}/load/hybrid",
-                    params={"data_dir": data_dir, "source": data_source},
-                    json={"api_config": api_config, "trade_ids": trade_ids, "date": date}
-                )
-            
-            if response.status_code != 200:
-                raise HTTPException(status_code=response.status_code, detail=f"Data loading failed: {response.text}")
-            
-            data_result = response.json()
-            workflow_result["steps"].append({
-                "step": "data_loading",
-                "status": "completed",
-                "result": data_result
-            })
-            
-            # Step 2: Reconciliation Analysis
-            logger.info("Step 2: Running reconciliation analysis...")
-            response = await self.client.post(
-                f"{self.service_urls['reconciliation']}/full-reconciliation",
-                json={"data": data_result.get("data", [])},
-                params={"pv_tolerance": pv_tolerance, "delta_tolerance": delta_tolerance}
-            )
-            
-            if response.status_code != 200:
-                raise HTTPException(status_code=response.status_code, detail=f"Reconciliation failed: {response.text}")
-            
-            recon_result = response.json()
-            workflow_result["steps"].append({
-                "step": "reconciliation",
-                "status": "completed", 
-                "result": recon_result
-            })
-            
-            # Step 3: ML Training (if requested)
-            if train_ml:
-                logger.info("Step 3: Training ML model...")
-                response = await self.client.post(
-                    f"{self.service_urls['ml']}/train",
-                    json={"data": recon_result.get("data", [])}
-                )
-                
-                if response.status_code == 200:
-                    ml_result = response.json()
-                    workflow_result["steps"].append({
-                        "step": "ml_training",
-                        "status": "completed",
-                        "result": ml_result
-                    })
+            self._register_workflow(workflow_result)
+            results: Dict[str, Dict[str, Any]] = {}
+
+            async def load_data_step() -> Dict[str, Any]:
+                async with self._semaphores["data"]:
+                    if data_source == "files":
+                        response = await self._client_for("data").post(
+                            f"{self.service_urls['data']}/load/files",
+                            params={"data_dir": data_dir}
+                        )
+                    elif data_source == "api":
+                        response = await self._client_for("data").post(
+                            f"{self.service_urls['data']}/load/api",
+                            json={"api_config": api_config, "trade_ids": trade_ids, "date": date}
+                        )
+                    else:  # hybrid
+                        response = await self._client_for("data").post(
+                            f"{self.service_urls['data']}/load/hybrid",
+                            params={"data_dir": data_dir, "source": data_source},
+                            json={"api_config": api_config, "trade_ids": trade_ids, "date": date}
+                        )
+                if response.status_code != 200:
+                    return {"status": "failed", "error": f"Data loading failed: {response.text}"}
+                return {"status": "completed", "result": response_json(response)}
+
+            async def recon_step() -> Dict[str, Any]:
+                data_result = results["data_loading"]["result"]
+                if data_result.get("data_ref"):
+                    # Pass the loaded frame by reference instead of round-
+                    # tripping every row through JSON
+                    recon_request = {"data_ref": data_result["data_ref"]}
                 else:
-                    workflow_result["steps"].append({
-                        "step": "ml_training",
-                        "status": "failed",
-                        "error": response.text
-                    })
-            
-            # Step 4: Generate Reports (if requested)
-            if generate_reports:
-                logger.info("Step 4: Generating reports...")
-                
-                # Generate summary report
-                response = await self.client.post(
-                    f"{self.service_urls['report']}/summary",
-                    json={"data": recon_result.get("data", [])}
-                )
-                
-                if response.status_code == 200:
-                    summary_result = response.json()
-                    workflow_result["steps"].append({
-                        "step": "summary_report",
-                        "status": "completed",
-                        "result": summary_result
-                    })
-                
-                # Generate detailed report
-                response = await self.client.post(
-                    f"{self.service_urls['report']}/detailed",
-                    json={"data": recon_result.get("data", [])},
+                    recon_request = {"data": data_result.get("data", [])}
+                async with self._semaphores["reconciliation"]:
+                    response = await self._client_for("reconciliation").post(
+                        f"{self.service_urls['reconciliation']}/full-reconciliation",
+                        json=recon_request,
+                        params={"pv_tolerance": pv_tolerance, "delta_tolerance": delta_tolerance}
+                    )
+                if response.status_code != 200:
+                    return {"status": "failed", "error": f"Reconciliation failed: {response.text}"}
+                return {"status": "completed", "result": response_json(response)}
+
+            # Encoded once on first use; every post-recon step forwards the
+            # same bytes instead of re-serializing the payload per request
+            recon_content_cache: Dict[str, bytes] = {}
+
+            def recon_content() -> bytes:
+                if "bytes" not in recon_content_cache:
+                    recon_result = results["reconciliation"]["result"]
+                    if recon_result.get("data_ref"):
+                        recon_data = {"data_ref": recon_result["data_ref"]}
+                    else:
+                        recon_data = {"data": recon_result.get("data", [])}
+                    recon_content_cache["bytes"] = orjson.dumps(recon_data)
+                return recon_content_cache["bytes"]
+
+            async def ml_step() -> Dict[str, Any]:
+                return await self._post_step("ml", "/train", content=recon_content())
+
+            async def summary_step() -> Dict[str, Any]:
+                return await self._post_step("report", "/summary", content=recon_content())
+
+            async def detailed_step() -> Dict[str, Any]:
+                return await self._post_step(
+                    "report", "/detailed",
+                    content=recon_content(),
                     params={"format": "excel"}
                 )
-                
-                if response.status_code == 200:
-                    detailed_result = response.json()
-                    workflow_result["steps"].append({
-                        "step": "detailed_report",
-                        "status": "completed",
-                        "result": detailed_result
-                    })
-            
+
+            # The workflow DAG: data -> recon -> {ml, summary, detailed}.
+            # New steps slot in by naming their dependencies instead of
+            # finding the right place in a hand-ordered sequence.
+            steps = [
+                WorkflowStep("data_loading", (), load_data_step, critical=True),
+                WorkflowStep("reconciliation", ("data_loading",), recon_step, critical=True)
+            ]
+            if train_ml:
+                steps.append(WorkflowStep("ml_training", ("reconciliation",), ml_step))
+            if generate_reports:
+                steps.append(WorkflowStep(
+                    "summary_report", ("reconciliation",), summary_step,
+                    deferred=defer_reports
+                ))
+                steps.append(WorkflowStep(
+                    "detailed_report", ("reconciliation",), detailed_step,
+                    deferred=defer_reports
+                ))
+
+            error = await self._run_dag(steps, workflow_result, results)
+
             workflow_result["end_time"] = datetime.now().isoformat()
-            workflow_result["status"] = "completed"
-            
+            if error:
+                workflow_result["status"] = "failed"
+                workflow_result["error"] = error
+            else:
+                workflow_result["status"] = "completed"
+
             return workflow_result
             
         except Exception as e:
@@ -186,41 +523,41 @@ class OrchestratorService:
             workflow_result["error"] = str(e)
             return workflow_result
     
+    # Service-specific info endpoints queried by get_service_status
+    INFO_ENDPOINTS = {
+        "ml": "/model/info",
+        "report": "/list",
+        "reconciliation": "/config/tolerances",
+        "data": "/sources/available"
+    }
+
+    async def _fetch_service_info(self, service_name: str, url: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Fetch a single service's info endpoint"""
+        try:
+            response = await self._client_for(service_name).get(f"{url}{self.INFO_ENDPOINTS[service_name]}")
+            if response.status_code == 200:
+                return service_name, response.json()
+            return service_name, None
+        except Exception as e:
+            return service_name, {"error": str(e)}
+
     async def get_service_status(self) -> Dict[str, Any]:
         """Get comprehensive status of all services"""
         try:
             health_status = await self.check_service_health()
-            
-            # Get additional info from each service
-            service_info = {}
-            
-            for service_name, url in self.service_urls.items():
-                if health_status[service_name]["status"] == "healthy":
-                    try:
-                        # Get service-specific info
-                        if service_name == "ml":
-                            response = await self.client.get(f"{url}/model/info")
-                            if response.status_code == 200:
-                                service_info[service_name] = response.json()
-                        
-                        elif service_name == "report":
-                            response = await self.client.get(f"{url}/list")
-                            if response.status_code == 200:
-                                service_info[service_name] = response.json()
-                        
-                        elif service_name == "reconciliation":
-                            response = await self.client.get(f"{url}/config/tolerances")
-                            if response.status_code == 200:
-                                service_info[service_name] = response.json()
-                        
-                        elif service_name == "data":
-                            response = await self.client.get(f"{url}/sources/available")
-                            if response.status_code == 200:
-                                service_info[service_name] = response.json()
-                    
-                    except Exception as e:
-                        service_info[service_name] = {"error": str(e)}
-            
+
+            # Fetch the per-service info endpoints concurrently, same as
+            # the health probes
+            healthy = [
+                (name, url) for name, url in self.service_urls.items()
+                if name in self.INFO_ENDPOINTS
+                and health_status[name]["status"] == "healthy"
+            ]
+            results = await asyncio.gather(
+                *[self._fetch_service_info(name, url) for name, url in healthy]
+            )
+            service_info = {name: info for name, info in results if info is not None}
+
             return {
                 "health_status": health_status,
                 "service_info": service_info,
@@ -234,18 +571,30 @@ class OrchestratorService:
     async def cleanup_workflow(self, workflow_id: str) -> Dict[str, Any]:
         """Cleanup resources for a specific workflow"""
         try:
-            # This could include cleaning up temporary files, resetting models, etc.
             cleanup_result = {
                 "workflow_id": workflow_id,
                 "cleanup_time": datetime.now().isoformat(),
                 "actions": []
             }
-            
-            # Example cleanup actions
-            cleanup_result["actions"].append("Workflow cleanup completed")
-            
+
+            # Drop the stored state and delete the parquet frames its
+            # steps produced on the shared volume
+            state = self._workflow_state.pop(workflow_id, None)
+            if state is None:
+                cleanup_result["actions"].append("No stored state for workflow")
+                return cleanup_result
+
+            removed = 0
+            for step in state.get("steps", []):
+                data_ref = (step.get("result") or {}).get("data_ref")
+                if data_ref and shared_data.remove_dataframe(data_ref):
+                    removed += 1
+            cleanup_result["actions"].append(
+                f"Removed workflow state and {removed} stored frames"
+            )
+
             return cleanup_result
-            
+
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
             raise
@@ -253,16 +602,23 @@ class OrchestratorService:
 # Initialize service
 orchestrator_service = OrchestratorService()
 
+@app.on_event("shutdown")
+async def close_client():
+    """Release pooled connections on shutdown"""
+    await orchestrator_service.client.aclose()
+    for client in orchestrator_service._uds_clients.values():
+        await client.aclose()
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "service": "orchestrator_service"}
 
 @app.get("/services/health")
-async def check_services_health():
+async def check_services_health(fresh: bool = False):
     """Check health of all services"""
     try:
-        health_status = await orchestrator_service.check_service_health()
+        health_status = await orchestrator_service.check_service_health(fresh=fresh)
         
         return {
             "status": "success",
@@ -294,7 +650,8 @@ async def run_workflow(
     pv_tolerance: float = 1000,
     delta_tolerance: float = 0.05,
     train_ml: bool = True,
-    generate_reports: bool = True
+    generate_reports: bool = True,
+    defer_reports: bool = False
 ):
     """Run the complete reconciliation workflow"""
     try:
@@ -307,7 +664,8 @@ async def run_workflow(
             pv_tolerance=pv_tolerance,
             delta_tolerance=delta_tolerance,
             train_ml=train_ml,
-            generate_reports=generate_reports
+            generate_reports=generate_reports,
+            defer_reports=defer_reports
         )
         
         return {
@@ -317,6 +675,17 @@ async def run_workflow(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/workflow/{workflow_id}")
+async def get_workflow(workflow_id: str):
+    """Get current state of a workflow (deferred steps land here)"""
+    state = orchestrator_service._workflow_state.get(workflow_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Workflow not found")
+    return {
+        "status": "success",
+        "workflow": state
+    }
+
 @app.post("/workflow/cleanup/{workflow_id}")
 async def cleanup_workflow(workflow_id: str):
     """Cleanup resources for a specific workflow"""
@@ -342,9 +711,13 @@ async def get_workflow_config():
             "generate_reports": True
         },
         "supported_data_sources": ["files", "api", "hybrid"],
-        "service_urls": orchestrator_service.service_urls
+        "service_urls": orchestrator_service.service_urls,
+        "service_concurrency": SERVICE_CONCURRENCY
     }
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8005) 
\ No newline at end of file
+    if USE_UDS:
+        uvicorn.run(app, uds=uds_path("orchestrator"))
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=8005) 
\ No newline at end of file
@@ -3,17 +3,27 @@
 Reconciliation Service - Handles mismatch detection and rule-based analysis
 """
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
+import numpy as np
 import pandas as pd
 from typing import Dict, Any, List, Optional
 import logging
 
+try:
+    import zstandard
+except ImportError:  # optional; large-response compression just stays off
+    zstandard = None
+
 # Import existing reconciliation logic
+import os
 import sys
-sys.path.append('..')
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
 from crew.agents.recon_agent import ReconAgent
 from crew.agents.analyzer_agent import AnalyzerAgent
+from services import shared_data
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -22,13 +32,102 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Reconciliation Service",
     description="Service for mismatch detection and rule-based analysis",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
+# Record payloads compress ~5-10x (repeated keys, similar floats); only
+# bodies above this size are worth the CPU
+ZSTD_MIN_SIZE = 32_000
+
+if zstandard is not None:
+    @app.middleware("http")
+    async def zstd_compress_large_responses(request: Request, call_next):
+        """Compress large bodies with zstd for clients that advertise it"""
+        response = await call_next(request)
+        if ("zstd" not in request.headers.get("accept-encoding", "")
+                or response.headers.get("content-encoding")):
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        headers = dict(response.headers)
+        if len(body) > ZSTD_MIN_SIZE:
+            body = zstandard.ZstdCompressor().compress(body)
+            headers["content-encoding"] = "zstd"
+        headers["content-length"] = str(len(body))
+        return Response(body, status_code=response.status_code,
+                        headers=headers, media_type=response.media_type)
+
+def result_payload(df: pd.DataFrame, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape the result rows for an endpoint response.
+
+    Callers that passed a data_ref (or asked with return_ref) get a fresh
+    ref and no inline echo; inline callers get their rows back without
+    paying a parquet write they would never read.
+    """
+    if "data_ref" in data or data.get("return_ref"):
+        return {
+            "data_ref": shared_data.store_dataframe(df, "recon"),
+            "data": []
+        }
+    return {
+        "data_ref": None,
+        "data": df.to_dict(orient='records')
+    }
+
+# Fields returned by get_trade_details, mapped to their source columns
+TRADE_DETAIL_FIELDS = {
+    "pv_old": "PV_old",
+    "pv_new": "PV_new",
+    "pv_diff": "PV_Diff",
+    "pv_mismatch": "PV_Mismatch",
+    "delta_old": "Delta_old",
+    "delta_new": "Delta_new",
+    "delta_diff": "Delta_Diff",
+    "delta_mismatch": "Delta_Mismatch",
+    "any_mismatch": "Any_Mismatch",
+    "diagnosis": "Diagnosis",
+    "product_type": "ProductType",
+    "funding_curve": "FundingCurve",
+    "csa_type": "CSA_Type",
+    "model_version": "ModelVersion"
+}
+
 class ReconciliationService:
     def __init__(self):
         self.recon_agent = ReconAgent()
         self.analyzer_agent = AnalyzerAgent()
+        # data_ref -> TradeID-indexed frame, so repeated point lookups on
+        # the same stored frame skip both the parquet load and the O(N) scan
+        self._indexed_cache: Dict[str, pd.DataFrame] = {}
+
+    def resolve_indexed(self, data: Dict[str, Any]) -> pd.DataFrame:
+        """TradeID-indexed frame for a request payload.
+
+        On a data_ref cache hit the stored index is reused without
+        touching the parquet file at all; otherwise the payload is
+        resolved and indexed (and cached when it came by ref).
+        """
+        cache_key = data.get("data_ref")
+        if cache_key is not None:
+            indexed = self._indexed_cache.get(cache_key)
+            if indexed is not None:
+                return indexed
+        return self._get_indexed(shared_data.resolve_payload(data), cache_key)
+
+    def _get_indexed(self, df: pd.DataFrame, cache_key: Optional[str] = None) -> pd.DataFrame:
+        """Return df indexed by TradeID, cached per data_ref when given"""
+        if cache_key is not None:
+            indexed = self._indexed_cache.get(cache_key)
+            if indexed is not None:
+                return indexed
+
+        indexed = df.set_index('TradeID', drop=False)
+        if cache_key is not None:
+            if len(self._indexed_cache) >= 4:
+                self._indexed_cache.clear()
+            self._indexed_cache[cache_key] = indexed
+        return indexed
     
     def detect_mismatches(self, df: pd.DataFrame, pv_tolerance: float = 1000, delta_tolerance: float = 0.05) -> pd.DataFrame:
         """Detect PV and Delta mismatches"""
@@ -50,9 +149,12 @@ class ReconciliationService:
         """Apply rule-based diagnosis to flagged trades"""
         try:
             df_with_diagnosis = self.analyzer_agent.apply(df)
-            
-            # Count diagnoses
-            diagnosis_counts = df_with_diagnosis['Diagnosis'].value_counts().to_dict()
+
+            # Count diagnoses (the analyzer emits separate PV and Delta columns)
+            diagnosis_counts = {
+                "pv": df_with_diagnosis['PV_Diagnosis'].value_counts().to_dict(),
+                "delta": df_with_diagnosis['Delta_Diagnosis'].value_counts().to_dict()
+            }
             logger.info(f"Applied rule-based diagnosis: {diagnosis_counts}")
             
             return df_with_diagnosis
@@ -63,46 +165,75 @@ class ReconciliationService:
     def get_mismatch_summary(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Get summary of mismatches and diagnoses"""
         try:
+            columns = set(df.columns)
+            total_trades = len(df)
+
+            def count_true(col: str) -> int:
+                # np.count_nonzero over the bool buffer is a single C pass
+                # (and plain int keeps the JSON encoder on its fast path)
+                if col not in columns:
+                    return 0
+                return int(np.count_nonzero(df[col].to_numpy(dtype=bool)))
+
+            any_mismatches = count_true('Any_Mismatch')
             summary = {
-                "total_trades": len(df),
-                "pv_mismatches": df['PV_Mismatch'].sum() if 'PV_Mismatch' in df.columns else 0,
-                "delta_mismatches": df['Delta_Mismatch'].sum() if 'Delta_Mismatch' in df.columns else 0,
-                "any_mismatches": df['Any_Mismatch'].sum() if 'Any_Mismatch' in df.columns else 0,
-                "diagnosis_distribution": df['Diagnosis'].value_counts().to_dict() if 'Diagnosis' in df.columns else {},
-                "mismatch_rate": (df['Any_Mismatch'].sum() / len(df) * 100) if 'Any_Mismatch' in df.columns else 0
+                "total_trades": total_trades,
+                "pv_mismatches": count_true('PV_Mismatch'),
+                "delta_mismatches": count_true('Delta_Mismatch'),
+                "any_mismatches": any_mismatches,
+                "diagnosis_distribution": df['Diagnosis'].value_counts().to_dict() if 'Diagnosis' in columns else {},
+                "mismatch_rate": (any_mismatches / total_trades * 100) if total_trades and 'Any_Mismatch' in columns else 0
             }
-            
+
             return summary
         except Exception as e:
             logger.error(f"Error generating mismatch summary: {e}")
             raise
     
-    def get_trade_details(self, df: pd.DataFrame, trade_id: str) -> Dict[str, Any]:
-        """Get detailed analysis for a specific trade"""
+    def get_trades_details(self, indexed: pd.DataFrame,
+                           trade_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get details for a batch of trades from a TradeID-indexed frame"""
+        try:
+            # reindex needs unique labels; first occurrence wins, matching
+            # the single-trade lookup
+            if indexed.index.has_duplicates:
+                indexed = indexed[~indexed.index.duplicated(keep='first')]
+            rows = indexed.reindex(trade_ids)
+
+            details = []
+            for trade_id, values in zip(trade_ids, rows.to_dict(orient='records')):
+                if pd.isna(values.get('TradeID')):
+                    # reindex fills unknown ids with NaN rows
+                    details.append({"trade_id": trade_id, "found": False})
+                    continue
+                entry = {"trade_id": trade_id, "found": True}
+                for field, column in TRADE_DETAIL_FIELDS.items():
+                    default = False if field.endswith('mismatch') else None
+                    entry[field] = values.get(column, default)
+                details.append(entry)
+            return details
+        except Exception as e:
+            logger.error(f"Error getting batch trade details: {e}")
+            raise
+
+    def get_trade_details(self, indexed: pd.DataFrame, trade_id: str) -> Dict[str, Any]:
+        """Get detailed analysis for a specific trade (TradeID-indexed frame)"""
         try:
-            trade_data = df[df['TradeID'] == trade_id]
-            if trade_data.empty:
+            try:
+                trade = indexed.loc[trade_id]
+            except KeyError:
                 raise ValueError(f"Trade {trade_id} not found")
-            
-            trade = trade_data.iloc[0]
-            details = {
-                "trade_id": trade_id,
-                "pv_old": trade.get('PV_old'),
-                "pv_new": trade.get('PV_new'),
-                "pv_diff": trade.get('PV_Diff'),
-                "pv_mismatch": trade.get('PV_Mismatch', False),
-                "delta_old": trade.get('Delta_old'),
-                "delta_new": trade.get('Delta_new'),
-                "delta_diff": trade.get('Delta_Diff'),
-                "delta_mismatch": trade.get('Delta_Mismatch', False),
-                "any_mismatch": trade.get('Any_Mismatch', False),
-                "diagnosis": trade.get('Diagnosis'),
-                "product_type": trade.get('ProductType'),
-                "funding_curve": trade.get('FundingCurve'),
-                "csa_type": trade.get('CSA_Type'),
-                "model_version": trade.get('ModelVersion')
-            }
-            
+            if isinstance(trade, pd.DataFrame):
+                # Duplicate TradeIDs: keep the first, matching the old scan
+                trade = trade.iloc[0]
+
+            # One C-level traversal instead of a .get dispatch per field
+            values = trade.to_dict()
+            details = {"trade_id": trade_id}
+            for field, column in TRADE_DETAIL_FIELDS.items():
+                default = False if field.endswith('mismatch') else None
+                details[field] = values.get(column, default)
+
             return details
         except Exception as e:
             logger.error(f"Error getting trade details: {e}")
@@ -124,15 +255,15 @@ async def detect_mismatches(
 ):
     """Detect PV and Delta mismatches in the data"""
     try:
-        df = pd.DataFrame(data.get("data", []))
+        df = shared_data.resolve_payload(data)
         if df.empty:
             raise HTTPException(status_code=400, detail="No data provided")
         
         df_with_flags = reconciliation_service.detect_mismatches(df, pv_tolerance, delta_tolerance)
-        
+
         return {
             "status": "success",
-            "data": df_with_flags.to_dict(orient='records'),
+            **result_payload(df_with_flags, data),
             "summary": reconciliation_service.get_mismatch_summary(df_with_flags),
             "message": f"Detected mismatches with tolerances: PV={pv_tolerance}, Delta={delta_tolerance}"
         }
@@ -143,15 +274,15 @@ async def detect_mismatches(
 async def apply_diagnosis(data: Dict[str, Any]):
     """Apply rule-based diagnosis to the data"""
     try:
-        df = pd.DataFrame(data.get("data", []))
+        df = shared_data.resolve_payload(data)
         if df.empty:
             raise HTTPException(status_code=400, detail="No data provided")
         
         df_with_diagnosis = reconciliation_service.apply_rule_based_diagnosis(df)
-        
+
         return {
             "status": "success",
-            "data": df_with_diagnosis.to_dict(orient='records'),
+            **result_payload(df_with_diagnosis, data),
             "summary": reconciliation_service.get_mismatch_summary(df_with_diagnosis),
             "message": "Applied rule-based diagnosis"
         }
@@ -166,19 +297,21 @@ async def full_reconciliation(
 ):
     """Perform full reconciliation (mismatch detection + diagnosis)"""
     try:
-        df = pd.DataFrame(data.get("data", []))
+        df = shared_data.resolve_payload(data)
         if df.empty:
             raise HTTPException(status_code=400, detail="No data provided")
         
-        # Step 1: Detect mismatches
-        df_with_flags = reconciliation_service.detect_mismatches(df, pv_tolerance, delta_tolerance)
-        
-        # Step 2: Apply diagnosis
-        df_with_diagnosis = reconciliation_service.apply_rule_based_diagnosis(df_with_flags)
-        
+        # Mismatch detection and diagnosis both annotate and return the
+        # same frame, so the passes chain in place - no intermediate copy
+        df_with_diagnosis = reconciliation_service.apply_rule_based_diagnosis(
+            reconciliation_service.detect_mismatches(df, pv_tolerance, delta_tolerance)
+        )
+
+        # Persist the result so downstream services can fetch it by
+        # reference; inline records are only echoed back to inline callers
         return {
             "status": "success",
-            "data": df_with_diagnosis.to_dict(orient='records'),
+            **result_payload(df_with_diagnosis, data),
             "summary": reconciliation_service.get_mismatch_summary(df_with_diagnosis),
             "message": "Completed full reconciliation analysis"
         }
@@ -189,11 +322,13 @@ async def full_reconciliation(
 async def get_trade_details(trade_id: str, data: Dict[str, Any]):
     """Get detailed analysis for a specific trade"""
     try:
-        df = pd.DataFrame(data.get("data", []))
-        if df.empty:
+        # The indexed cache is consulted before the payload is resolved,
+        # so repeat data_ref lookups skip the parquet read entirely
+        indexed = reconciliation_service.resolve_indexed(data)
+        if indexed.empty:
             raise HTTPException(status_code=400, detail="No data provided")
-        
-        trade_details = reconciliation_service.get_trade_details(df, trade_id)
+
+        trade_details = reconciliation_service.get_trade_details(indexed, trade_id)
         
         return {
             "status": "success",
@@ -202,11 +337,33 @@ async def get_trade_details(trade_id: str, data: Dict[str, Any]):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/trades/details")
+async def get_trades_details(data: Dict[str, Any]):
+    """Get detailed analysis for a batch of trades in one pass"""
+    try:
+        trade_ids = data.get("trade_ids") or []
+        if not trade_ids:
+            raise HTTPException(status_code=400, detail="No trade_ids provided")
+
+        indexed = reconciliation_service.resolve_indexed(data)
+        if indexed.empty:
+            raise HTTPException(status_code=400, detail="No data provided")
+
+        details = reconciliation_service.get_trades_details(indexed, trade_ids)
+
+        return {
+            "status": "success",
+            "trade_details": details,
+            "count": len(details)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/summary")
 async def get_summary(data: Dict[str, Any]):
     """Get reconciliation summary"""
     try:
-        df = pd.DataFrame(data.get("data", []))
+        df = shared_data.resolve_payload(data)
         if df.empty:
             raise HTTPException(status_code=400, detail="No data provided")
         
@@ -243,4 +400,9 @@ async def update_tolerance_config(pv_tolerance: float, delta_tolerance: float):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8002) 
\ No newline at end of file
+    if os.environ.get("RECON_USE_UDS", "").lower() in ("1", "true", "yes"):
+        # Co-located deployments skip loopback TCP entirely
+        uds_dir = os.environ.get("RECON_UDS_DIR", "/tmp")
+        uvicorn.run(app, uds=os.path.join(uds_dir, "recon_reconciliation.sock"))
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=8002)
@@ -3,58 +3,212 @@
 Report Service - Handles report generation and export functionality
 """
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import ORJSONResponse, FileResponse
+from fastapi.routing import APIRoute
+import numpy as np
+import orjson
 import pandas as pd
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+import hashlib
+import io
 import logging
 import os
 import tempfile
+import uuid
+import zipfile
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime
+from xml.sax.saxutils import escape
 
 # Import existing report logic
 import sys
-sys.path.append('..')
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
 from crew.agents.narrator_agent import NarratorAgent
+from services import shared_data
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class ORJSONRequest(Request):
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+class ORJSONRoute(APIRoute):
+    """Route class that decodes request bodies with orjson.
+
+    The report endpoints take whole record sets in the body; orjson's
+    SIMD scanner decodes them ~3x faster than the stdlib parser Starlette
+    uses by default.
+    """
+    def get_route_handler(self):
+        original_handler = super().get_route_handler()
+
+        async def handler(request: Request):
+            return await original_handler(
+                ORJSONRequest(request.scope, request.receive)
+            )
+
+        return handler
+
 app = FastAPI(
     title="Report Service",
     description="Service for report generation and export functionality",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
+app.router.route_class = ORJSONRoute
+
+try:
+    import polars as pl
+except ImportError:  # optional; summaries fall back to the numpy path
+    pl = None
+
+# Row count above which Excel exports skip the writer library and emit
+# the sheet XML directly
+RAW_XLSX_THRESHOLD = 50_000
+
+# Low-cardinality columns worth dictionary-encoding before an Excel write
+LOW_CARDINALITY_COLUMNS = ('ProductType', 'Diagnosis', 'CSA_Type',
+                           'FundingCurve', 'ModelVersion')
+
+# Minimal XLSX skeleton; worksheets are zipped in alongside these
+XLSX_STATIC_PARTS = {
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/styles.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="1"><fill><patternFill patternType="none"/></fill></fills>'
+        '<borders count="1"><border/></borders>'
+        '<cellStyleXfs count="1"><xf/></cellStyleXfs>'
+        '<cellXfs count="1"><xf xfId="0"/></cellXfs>'
+        '<dxfs count="1"><dxf><fill><patternFill>'
+        '<bgColor rgb="FFFFC7CE"/></patternFill></fill></dxf></dxfs>'
+        '</styleSheet>'
+    )
+}
+
+def _narrate_worker(parquet_bytes: bytes, report_dir: str) -> str:
+    """Generate and write a narrative report (runs in a worker process).
+
+    The frame travels as parquet bytes - cheap to pickle across the
+    process boundary - and the worker builds its own NarratorAgent.
+    """
+    df = pd.read_parquet(io.BytesIO(parquet_bytes))
+    narrative = NarratorAgent().generate_narrative(df)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filepath = os.path.join(report_dir, f"narrative_report_{timestamp}.txt")
+    with open(filepath, 'w') as f:
+        f.write(narrative)
+    return filepath
 
 class ReportService:
     def __init__(self):
         self.narrator_agent = NarratorAgent()
         self.report_dir = "reports"
-        
+        # data_ref -> TradeID-indexed frame so repeated per-trade analyses
+        # against the same stored frame skip the O(N) column scan
+        self._indexed_cache: Dict[str, pd.DataFrame] = {}
+        # frame fingerprint -> path of the narrative already written for it
+        self._narrative_cache: Dict[str, str] = {}
+        # filename -> stat result, refreshed by get_report_list; doubles
+        # as a whitelist so download paths can't point outside report_dir
+        self._known_reports: Dict[str, os.stat_result] = {}
+        # (report_dir mtime, listing): the directory's mtime changes when
+        # reports are added or deleted, so one stat answers unchanged polls
+        self._list_cache: Optional[Tuple[float, List[Dict[str, Any]]]] = None
+        # Background narrative jobs: job_id -> future; the pool is spun up
+        # on first use so services that never narrate don't fork workers
+        self._narrative_executor: Optional[ProcessPoolExecutor] = None
+        self._narrative_jobs: Dict[str, Future] = {}
+
         # Create reports directory if it doesn't exist
         if not os.path.exists(self.report_dir):
             os.makedirs(self.report_dir)
+
+    def resolve_indexed(self, data: Dict[str, Any]) -> pd.DataFrame:
+        """TradeID-indexed frame for a request payload.
+
+        On a data_ref cache hit the stored index is reused without
+        touching the parquet file at all; otherwise the payload is
+        resolved and indexed (and cached when it came by ref).
+        """
+        cache_key = data.get("data_ref")
+        if cache_key is not None:
+            indexed = self._indexed_cache.get(cache_key)
+            if indexed is not None:
+                return indexed
+        return self._get_indexed(shared_data.resolve_payload(data), cache_key)
+
+    def _get_indexed(self, df: pd.DataFrame, cache_key: Optional[str] = None) -> pd.DataFrame:
+        """Return df indexed by TradeID, cached per data_ref when given"""
+        if cache_key is not None:
+            indexed = self._indexed_cache.get(cache_key)
+            if indexed is not None:
+                return indexed
+
+        indexed = df.set_index('TradeID', drop=False)
+        if cache_key is not None:
+            if len(self._indexed_cache) >= 4:
+                self._indexed_cache.clear()
+            self._indexed_cache[cache_key] = indexed
+        return indexed
     
     def generate_summary_report(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Generate a summary report of the reconciliation analysis"""
         try:
-            # Calculate summary statistics
+            # Calculate summary statistics: one numpy pass over the flag
+            # columns present, returning plain ints so the JSON encoder
+            # stays off the numpy-scalar path
+            columns = set(df.columns)
             total_trades = len(df)
-            pv_mismatches = df['PV_Mismatch'].sum() if 'PV_Mismatch' in df.columns else 0
-            delta_mismatches = df['Delta_Mismatch'].sum() if 'Delta_Mismatch' in df.columns else 0
-            any_mismatches = df['Any_Mismatch'].sum() if 'Any_Mismatch' in df.columns else 0
-            
-            # Get diagnosis distribution
-            diagnosis_distribution = {}
-            if 'Diagnosis' in df.columns:
-                diagnosis_distribution = df['Diagnosis'].value_counts().to_dict()
-            
-            # Get product type distribution
-            product_distribution = {}
-            if 'ProductType' in df.columns:
-                product_distribution = df['ProductType'].value_counts().to_dict()
-            
+
+            flag_columns = [c for c in ('PV_Mismatch', 'Delta_Mismatch', 'Any_Mismatch')
+                            if c in columns]
+            counts = dict.fromkeys(('PV_Mismatch', 'Delta_Mismatch', 'Any_Mismatch'), 0)
+            if flag_columns and total_trades:
+                if pl is not None:
+                    # Polars sums the flag columns multithreaded over
+                    # Arrow buffers
+                    row = pl.from_pandas(df[flag_columns]).select(
+                        [pl.col(c).cast(pl.Boolean).sum() for c in flag_columns]
+                    ).row(0)
+                    counts.update(zip(flag_columns, (int(n) for n in row)))
+                else:
+                    flags = df[flag_columns].to_numpy(dtype=bool)
+                    counts.update(zip(flag_columns, (int(n) for n in flags.sum(axis=0))))
+            pv_mismatches = counts['PV_Mismatch']
+            delta_mismatches = counts['Delta_Mismatch']
+            any_mismatches = counts['Any_Mismatch']
+
+            def distribution(col: str) -> Dict[str, int]:
+                if col not in columns:
+                    return {}
+                dropped = df[col].dropna().astype(str)
+                if pl is not None:
+                    value_counts = pl.from_pandas(dropped).value_counts()
+                    return {value: int(n) for value, n in value_counts.iter_rows()}
+                # np.unique counts in one C pass over the raw values
+                values, value_counts = np.unique(
+                    dropped.to_numpy(dtype=str), return_counts=True
+                )
+                return dict(zip(values.tolist(), (int(n) for n in value_counts)))
+
+            diagnosis_distribution = distribution('Diagnosis')
+            product_distribution = distribution('ProductType')
+
             summary = {
                 "total_trades": total_trades,
                 "pv_mismatches": pv_mismatches,
@@ -83,27 +237,55 @@ class ReportService:
             
             if format.lower() == "excel":
                 filepath = os.path.join(self.report_dir, f"{filename}.xlsx")
-                
-                with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
+
+                # Dictionary-encode the low-cardinality columns so each
+                # unique label is stored (and serialized) once
+                for col in LOW_CARDINALITY_COLUMNS:
+                    if col in df.columns:
+                        df[col] = df[col].astype('category')
+
+                # Very large frames bypass the writer library entirely:
+                # per-cell library calls dominate there, while emitting the
+                # sheet XML directly is an order of magnitude faster
+                if len(df) > RAW_XLSX_THRESHOLD:
+                    self._write_xlsx_raw(filepath, df, summary)
+                    logger.info(f"Generated Excel report (raw writer): {filepath}")
+                    return filepath
+
+                # constant_memory streams each row straight to disk instead
+                # of materializing the whole workbook (openpyxl's default
+                # mode holds every cell object in memory)
+                with pd.ExcelWriter(
+                    filepath, engine='xlsxwriter',
+                    engine_kwargs={'options': {'constant_memory': True}}
+                ) as writer:
                     # Summary sheet
                     summary_df = pd.DataFrame([summary])
                     summary_df.to_excel(writer, sheet_name='Summary', index=False)
-                    
-                    # Detailed data sheet
+
+                    # Detailed data sheet, with mismatched rows
+                    # highlighted in place - no duplicated filtered sheet
                     df.to_excel(writer, sheet_name='Detailed_Data', index=False)
-                    
-                    # Mismatches only sheet
-                    if 'Any_Mismatch' in df.columns:
-                        mismatches_df = df[df['Any_Mismatch'] == True]
-                        if not mismatches_df.empty:
-                            mismatches_df.to_excel(writer, sheet_name='Mismatches_Only', index=False)
+                    if 'Any_Mismatch' in df.columns and len(df) > 0:
+                        self._highlight_mismatches(writer, df)
                 
                 logger.info(f"Generated Excel report: {filepath}")
                 return filepath
             
             elif format.lower() == "csv":
                 filepath = os.path.join(self.report_dir, f"{filename}.csv")
-                df.to_csv(filepath, index=False)
+                try:
+                    import pyarrow as pa
+                    import pyarrow.csv as pacsv
+
+                    # Arrow's multi-threaded writer is several times faster
+                    # than the single-threaded DataFrame.to_csv
+                    pacsv.write_csv(
+                        pa.Table.from_pandas(df, preserve_index=False),
+                        filepath
+                    )
+                except ImportError:
+                    df.to_csv(filepath, index=False)
                 logger.info(f"Generated CSV report: {filepath}")
                 return filepath
             
@@ -114,9 +296,201 @@ class ReportService:
             logger.error(f"Error generating detailed report: {e}")
             raise
     
+    @staticmethod
+    def _highlight_mismatches(writer: pd.ExcelWriter, df: pd.DataFrame) -> None:
+        """AutoFilter plus a red highlight on rows with Any_Mismatch set"""
+        from xlsxwriter.utility import xl_col_to_name
+
+        worksheet = writer.sheets['Detailed_Data']
+        worksheet.autofilter(0, 0, len(df), len(df.columns) - 1)
+        col_letter = xl_col_to_name(df.columns.get_loc('Any_Mismatch'))
+        red_format = writer.book.add_format({'bg_color': '#FFC7CE'})
+        worksheet.conditional_format(1, 0, len(df), len(df.columns) - 1, {
+            'type': 'formula',
+            'criteria': f'=${col_letter}2=TRUE',
+            'format': red_format
+        })
+
+    def _write_xlsx_raw(self, filepath: str, df: pd.DataFrame,
+                        summary: Dict[str, Any]) -> None:
+        """Write the detailed report by emitting XLSX sheet XML directly.
+
+        Mirrors the library path's sheet layout (Summary plus a
+        Detailed_Data sheet with mismatch highlighting) but formats each
+        row as XML and zips the parts, bypassing per-cell writer calls.
+        """
+        sheets = [
+            ('Summary', pd.DataFrame([summary])),
+            ('Detailed_Data', df)
+        ]
+
+        # Render the sheets first: categorical columns register their
+        # labels in the shared-string table, emitted once for the workbook
+        shared_strings: Dict[str, int] = {}
+        sheet_xml = [
+            self._sheet_xml(sheet_df, shared_strings,
+                            highlight_mismatches=(name == 'Detailed_Data'))
+            for name, sheet_df in sheets
+        ]
+
+        content_types = (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            + ('<Override PartName="/xl/sharedStrings.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+               if shared_strings else '')
+            + ''.join(
+                f'<Override PartName="/xl/worksheets/sheet{i}.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                for i in range(1, len(sheets) + 1)
+            )
+            + '</Types>'
+        )
+        workbook = (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+            ' xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheets>'
+            + ''.join(
+                f'<sheet name="{name}" sheetId="{i}" r:id="rId{i}"/>'
+                for i, (name, _) in enumerate(sheets, start=1)
+            )
+            + '</sheets></workbook>'
+        )
+        workbook_rels = (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            + ''.join(
+                f'<Relationship Id="rId{i}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet{i}.xml"/>'
+                for i in range(1, len(sheets) + 1)
+            )
+            + f'<Relationship Id="rId{len(sheets) + 1}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+            + (f'<Relationship Id="rId{len(sheets) + 2}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" Target="sharedStrings.xml"/>'
+               if shared_strings else '')
+            + '</Relationships>'
+        )
+
+        with zipfile.ZipFile(filepath, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr('[Content_Types].xml', content_types)
+            archive.writestr('xl/workbook.xml', workbook)
+            archive.writestr('xl/_rels/workbook.xml.rels', workbook_rels)
+            for part_name, part in XLSX_STATIC_PARTS.items():
+                archive.writestr(part_name, part)
+            if shared_strings:
+                archive.writestr('xl/sharedStrings.xml', (
+                    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                    f'<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" uniqueCount="{len(shared_strings)}">'
+                    + ''.join(f'<si><t>{s}</t></si>' for s in shared_strings)
+                    + '</sst>'
+                ))
+            for i, xml in enumerate(sheet_xml, start=1):
+                archive.writestr(f'xl/worksheets/sheet{i}.xml', xml)
+
+    @staticmethod
+    def _sheet_xml(df: pd.DataFrame, shared_strings: Dict[str, int],
+                   highlight_mismatches: bool = False) -> str:
+        """Render one worksheet as spreadsheetml.
+
+        Categorical columns write shared-string references - each unique
+        label lands in the workbook-level table exactly once. With
+        highlight_mismatches, rows flagged Any_Mismatch get an AutoFilter
+        plus a red conditional-format highlight instead of a duplicated
+        filtered sheet.
+        """
+        parts = [
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            '<sheetData>'
+        ]
+        header = ''.join(
+            f'<c t="inlineStr"><is><t>{escape(str(col))}</t></is></c>'
+            for col in df.columns
+        )
+        parts.append(f'<row>{header}</row>')
+
+        # Decide the cell renderer once per column from its dtype instead
+        # of isinstance-checking all N*M cells; only object columns (which
+        # can stay mixed after a JSON decode) keep the per-value check
+        kinds = []
+        for col in df.columns:
+            dtype = df[col].dtype
+            if isinstance(dtype, pd.CategoricalDtype):
+                kinds.append('c')
+            elif not isinstance(dtype, np.dtype):
+                # Extension dtypes (nullable Int64/boolean, arrow-backed)
+                # can yield pd.NA, which the fast NaN checks choke on;
+                # route them through the guarded object path
+                kinds.append('o')
+            elif pd.api.types.is_bool_dtype(dtype):
+                kinds.append('b')
+            elif pd.api.types.is_numeric_dtype(dtype):
+                kinds.append('n')
+            else:
+                kinds.append('o')
+
+        for row in df.itertuples(index=False, name=None):
+            cells = []
+            for kind, value in zip(kinds, row):
+                if kind == 'c':
+                    if value is None or value != value:
+                        cells.append('<c/>')
+                    else:
+                        label = escape(str(value))
+                        code = shared_strings.setdefault(label, len(shared_strings))
+                        cells.append(f'<c t="s"><v>{code}</v></c>')
+                elif kind == 'b':
+                    cells.append(f'<c t="b"><v>{int(value)}</v></c>')
+                elif kind == 'n':
+                    if value != value:  # NaN
+                        cells.append('<c/>')
+                    else:
+                        cells.append(f'<c t="n"><v>{value}</v></c>')
+                elif value is None or value is pd.NA:
+                    cells.append('<c/>')
+                elif isinstance(value, (bool, np.bool_)):
+                    cells.append(f'<c t="b"><v>{int(value)}</v></c>')
+                elif isinstance(value, (int, float, np.integer, np.floating)):
+                    if value != value:
+                        cells.append('<c/>')
+                    else:
+                        cells.append(f'<c t="n"><v>{value}</v></c>')
+                else:
+                    cells.append(f'<c t="inlineStr"><is><t>{escape(str(value))}</t></is></c>')
+            parts.append('<row>' + ''.join(cells) + '</row>')
+
+        parts.append('</sheetData>')
+
+        if highlight_mismatches and 'Any_Mismatch' in df.columns and len(df) > 0:
+            from xlsxwriter.utility import xl_col_to_name
+            last_cell = f"{xl_col_to_name(len(df.columns) - 1)}{len(df) + 1}"
+            flag_letter = xl_col_to_name(df.columns.get_loc('Any_Mismatch'))
+            parts.append(f'<autoFilter ref="A1:{last_cell}"/>')
+            parts.append(
+                f'<conditionalFormatting sqref="A2:{last_cell}">'
+                '<cfRule type="expression" dxfId="0" priority="1">'
+                f'<formula>${flag_letter}2=TRUE</formula>'
+                '</cfRule></conditionalFormatting>'
+            )
+
+        parts.append('</worksheet>')
+        return ''.join(parts)
+
     def generate_narrative_report(self, df: pd.DataFrame) -> str:
         """Generate a narrative report using the narrator agent"""
         try:
+            # Content-address the frame (vectorized row hashing) so an
+            # identical payload reuses the already-written narrative
+            # instead of re-running the narrator pass
+            fingerprint = hashlib.blake2b(
+                pd.util.hash_pandas_object(df, index=False).values.tobytes(),
+                digest_size=16
+            ).hexdigest()
+            cached = self._narrative_cache.get(fingerprint)
+            if cached and os.path.exists(cached):
+                logger.info(f"Returning cached narrative report: {cached}")
+                return cached
+
             # Generate narrative using the narrator agent
             narrative = self.narrator_agent.generate_narrative(df)
             
@@ -127,32 +501,97 @@ class ReportService:
             with open(filepath, 'w') as f:
                 f.write(narrative)
             
+            if len(self._narrative_cache) >= 64:
+                self._narrative_cache.clear()
+            self._narrative_cache[fingerprint] = filepath
             logger.info(f"Generated narrative report: {filepath}")
             return filepath
         except Exception as e:
             logger.error(f"Error generating narrative report: {e}")
             raise
     
+    def submit_narrative_job(self, df: pd.DataFrame) -> str:
+        """Dispatch narrative generation to the process pool.
+
+        Returns a job id immediately; the narrator runs off the event
+        loop's process entirely, so /summary and /list stay responsive
+        while a long narrative renders.
+        """
+        if self._narrative_executor is None:
+            self._narrative_executor = ProcessPoolExecutor(
+                max_workers=os.cpu_count()
+            )
+
+        buffer = io.BytesIO()
+        df.to_parquet(buffer, index=False)
+
+        job_id = uuid.uuid4().hex
+        if len(self._narrative_jobs) >= 64:
+            self._narrative_jobs = {
+                jid: fut for jid, fut in self._narrative_jobs.items()
+                if not fut.done()
+            }
+        self._narrative_jobs[job_id] = self._narrative_executor.submit(
+            _narrate_worker, buffer.getvalue(), self.report_dir
+        )
+        return job_id
+
+    def get_narrative_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Status of a background narrative job, or None if unknown"""
+        future = self._narrative_jobs.get(job_id)
+        if future is None:
+            return None
+        if not future.done():
+            return {"job_id": job_id, "status": "running"}
+        try:
+            filepath = future.result()
+        except Exception as e:
+            return {"job_id": job_id, "status": "failed", "error": str(e)}
+        return {
+            "job_id": job_id,
+            "status": "completed",
+            "filepath": filepath,
+            "filename": os.path.basename(filepath)
+        }
+
     def get_report_list(self) -> List[Dict[str, Any]]:
         """Get list of available reports"""
         try:
+            dir_mtime = os.stat(self.report_dir).st_mtime
+            if self._list_cache is not None and self._list_cache[0] == dir_mtime:
+                return self._list_cache[1]
+
+            # scandir hands back cached stat results - one syscall per
+            # entry instead of a listdir plus a stat per file; the
+            # constructor is bound once rather than looked up per file
+            fromtimestamp = datetime.fromtimestamp
             reports = []
-            for filename in os.listdir(self.report_dir):
-                if filename.endswith(('.xlsx', '.csv', '.txt')):
-                    filepath = os.path.join(self.report_dir, filename)
-                    file_stats = os.stat(filepath)
-                    
+            mtimes = []
+            known = {}
+            with os.scandir(self.report_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(('.xlsx', '.csv', '.txt')):
+                        continue
+                    file_stats = entry.stat()
+                    known[entry.name] = file_stats
+                    mtimes.append(file_stats.st_mtime)
                     reports.append({
-                        "filename": filename,
-                        "filepath": filepath,
+                        "filename": entry.name,
+                        "filepath": entry.path,
                         "size_bytes": file_stats.st_size,
-                        "created_at": datetime.fromtimestamp(file_stats.st_ctime).isoformat(),
-                        "modified_at": datetime.fromtimestamp(file_stats.st_mtime).isoformat(),
-                        "type": filename.split('.')[-1]
+                        "created_at": fromtimestamp(file_stats.st_ctime).isoformat(),
+                        "modified_at": fromtimestamp(file_stats.st_mtime).isoformat(),
+                        "modified_at_epoch": file_stats.st_mtime,
+                        "type": entry.name.rsplit('.', 1)[-1]
                     })
-            
-            # Sort by modification time (newest first)
-            reports.sort(key=lambda x: x['modified_at'], reverse=True)
+
+            # Sort newest first on the raw mtimes (numeric compare, not
+            # ISO-string compare)
+            reports = [report for _, report in sorted(
+                zip(mtimes, reports), key=lambda pair: pair[0], reverse=True
+            )]
+            self._known_reports = known
+            self._list_cache = (dir_mtime, reports)
             return reports
         except Exception as e:
             logger.error(f"Error getting report list: {e}")
@@ -164,6 +603,10 @@ class ReportService:
             filepath = os.path.join(self.report_dir, filename)
             if os.path.exists(filepath):
                 os.remove(filepath)
+                # Drop the cached stat and listing so a follow-up download
+                # 404s instead of serving a stale entry
+                self._known_reports.pop(filename, None)
+                self._list_cache = None
                 logger.info(f"Deleted report: {filepath}")
                 return True
             else:
@@ -172,41 +615,69 @@ class ReportService:
             logger.error(f"Error deleting report: {e}")
             raise
     
-    def get_trade_analysis(self, df: pd.DataFrame, trade_id: str) -> Dict[str, Any]:
-        """Get detailed analysis for a specific trade"""
-        try:
-            trade_data = df[df['TradeID'] == trade_id]
-            if trade_data.empty:
-                raise ValueError(f"Trade {trade_id} not found")
-            
-            trade = trade_data.iloc[0]
-            
-            analysis = {
-                "trade_id": trade_id,
-                "analysis": {
-                    "pv_analysis": {
-                        "old_value": trade.get('PV_old'),
-                        "new_value": trade.get('PV_new'),
-                        "difference": trade.get('PV_Diff'),
-                        "is_mismatch": trade.get('PV_Mismatch', False)
-                    },
-                    "delta_analysis": {
-                        "old_value": trade.get('Delta_old'),
-                        "new_value": trade.get('Delta_new'),
-                        "difference": trade.get('Delta_Diff'),
-                        "is_mismatch": trade.get('Delta_Mismatch', False)
-                    },
-                    "diagnosis": trade.get('Diagnosis'),
-                    "product_info": {
-                        "product_type": trade.get('ProductType'),
-                        "funding_curve": trade.get('FundingCurve'),
-                        "csa_type": trade.get('CSA_Type'),
-                        "model_version": trade.get('ModelVersion')
-                    }
+    @staticmethod
+    def _build_analysis(trade_id: str, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape one trade's analysis payload from its value mapping"""
+        return {
+            "trade_id": trade_id,
+            "analysis": {
+                "pv_analysis": {
+                    "old_value": values.get('PV_old'),
+                    "new_value": values.get('PV_new'),
+                    "difference": values.get('PV_Diff'),
+                    "is_mismatch": values.get('PV_Mismatch', False)
+                },
+                "delta_analysis": {
+                    "old_value": values.get('Delta_old'),
+                    "new_value": values.get('Delta_new'),
+                    "difference": values.get('Delta_Diff'),
+                    "is_mismatch": values.get('Delta_Mismatch', False)
+                },
+                "diagnosis": values.get('Diagnosis'),
+                "product_info": {
+                    "product_type": values.get('ProductType'),
+                    "funding_curve": values.get('FundingCurve'),
+                    "csa_type": values.get('CSA_Type'),
+                    "model_version": values.get('ModelVersion')
                 }
             }
-            
-            return analysis
+        }
+
+    def get_trade_analyses(self, indexed: pd.DataFrame,
+                           trade_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get analyses for a batch of trades off one indexed frame"""
+        try:
+            if indexed.index.has_duplicates:
+                indexed = indexed[~indexed.index.duplicated(keep='first')]
+            rows = indexed.reindex(trade_ids)
+
+            analyses = []
+            for trade_id, values in zip(trade_ids, rows.to_dict(orient='records')):
+                if pd.isna(values.get('TradeID')):
+                    analyses.append({"trade_id": trade_id, "found": False})
+                    continue
+                analysis = self._build_analysis(trade_id, values)
+                analysis["found"] = True
+                analyses.append(analysis)
+            return analyses
+        except Exception as e:
+            logger.error(f"Error getting batch trade analyses: {e}")
+            raise
+
+    def get_trade_analysis(self, indexed: pd.DataFrame, trade_id: str) -> Dict[str, Any]:
+        """Get detailed analysis for a specific trade (TradeID-indexed frame)"""
+        try:
+            try:
+                trade = indexed.loc[trade_id]
+            except KeyError:
+                raise ValueError(f"Trade {trade_id} not found")
+            if isinstance(trade, pd.DataFrame):
+                # Duplicate TradeIDs resolve to the first row, as before
+                trade = trade.iloc[0]
+
+            # One C-level traversal into a plain dict, then cheap dict
+            # lookups, instead of a Series.get dispatch per field
+            return self._build_analysis(trade_id, trade.to_dict())
         except Exception as e:
             logger.error(f"Error getting trade analysis: {e}")
             raise
@@ -223,7 +694,7 @@ async def health_check():
 async def generate_summary(data: Dict[str, Any]):
     """Generate a summary report"""
     try:
-        df = pd.DataFrame(data.get("data", []))
+        df = shared_data.resolve_payload(data)
         if df.empty:
             raise HTTPException(status_code=400, detail="No data provided")
         
@@ -243,7 +714,7 @@ async def generate_detailed_report(
 ):
     """Generate a detailed report"""
     try:
-        df = pd.DataFrame(data.get("data", []))
+        df = shared_data.resolve_payload(data)
         if df.empty:
             raise HTTPException(status_code=400, detail="No data provided")
         
@@ -260,13 +731,26 @@ async def generate_detailed_report(
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/narrative")
-async def generate_narrative_report(data: Dict[str, Any]):
-    """Generate a narrative report"""
+async def generate_narrative_report(data: Dict[str, Any], background: bool = False):
+    """Generate a narrative report.
+
+    With background=true the narrator runs in a worker process and the
+    response carries a job_id to poll via GET /narrative/{job_id}.
+    """
     try:
-        df = pd.DataFrame(data.get("data", []))
+        df = shared_data.resolve_payload(data)
         if df.empty:
             raise HTTPException(status_code=400, detail="No data provided")
-        
+
+        if background:
+            job_id = report_service.submit_narrative_job(df)
+            return {
+                "status": "accepted",
+                "job_id": job_id,
+                "poll": f"/narrative/{job_id}",
+                "message": "Narrative generation started"
+            }
+
         filepath = report_service.generate_narrative_report(df)
         
         return {
@@ -278,6 +762,17 @@ async def generate_narrative_report(data: Dict[str, Any]):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/narrative/{job_id}")
+async def get_narrative_job(job_id: str):
+    """Poll a background narrative job"""
+    status = report_service.get_narrative_job(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {
+        "status": "success",
+        "job": status
+    }
+
 @app.get("/list")
 async def get_reports():
     """Get list of available reports"""
@@ -296,14 +791,23 @@ async def get_reports():
 async def download_report(filename: str):
     """Download a specific report file"""
     try:
-        filepath = os.path.join(report_service.report_dir, filename)
-        if not os.path.exists(filepath):
+        # Serve off the cached stat from the last listing - no extra
+        # syscall per download, and unknown names (including traversal
+        # attempts) 404 without touching the filesystem
+        stats = report_service._known_reports.get(filename)
+        if stats is None:
+            # Refresh once in case the report was generated after the
+            # last listing
+            report_service.get_report_list()
+            stats = report_service._known_reports.get(filename)
+        if stats is None:
             raise HTTPException(status_code=404, detail="Report not found")
-        
+
         return FileResponse(
-            path=filepath,
+            path=os.path.join(report_service.report_dir, filename),
             filename=filename,
-            media_type='application/octet-stream'
+            media_type='application/octet-stream',
+            stat_result=stats
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -324,15 +828,38 @@ async def delete_report(filename: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/trades")
+async def get_trade_analyses(data: Dict[str, Any]):
+    """Get detailed analyses for a batch of trades in one pass"""
+    try:
+        trade_ids = data.get("trade_ids") or []
+        if not trade_ids:
+            raise HTTPException(status_code=400, detail="No trade_ids provided")
+
+        indexed = report_service.resolve_indexed(data)
+        if indexed.empty:
+            raise HTTPException(status_code=400, detail="No data provided")
+
+        analyses = report_service.get_trade_analyses(indexed, trade_ids)
+
+        return {
+            "status": "success",
+            "analyses": analyses,
+            "count": len(analyses)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/trade/{trade_id}")
 async def get_trade_analysis(trade_id: str, data: Dict[str, Any]):
     """Get detailed analysis for a specific trade"""
     try:
-        df = pd.DataFrame(data.get("data", []))
-        if df.empty:
+        # Cache-first: repeat data_ref lookups skip the parquet read
+        indexed = report_service.resolve_indexed(data)
+        if indexed.empty:
             raise HTTPException(status_code=400, detail="No data provided")
-        
-        analysis = report_service.get_trade_analysis(df, trade_id)
+
+        analysis = report_service.get_trade_analysis(indexed, trade_id)
         
         return {
             "status": "success",
@@ -354,4 +881,9 @@ async def get_available_formats():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8004) 
\ No newline at end of file
+    if os.environ.get("RECON_USE_UDS", "").lower() in ("1", "true", "yes"):
+        # Co-located deployments skip loopback TCP entirely
+        uds_dir = os.environ.get("RECON_UDS_DIR", "/tmp")
+        uvicorn.run(app, uds=os.path.join(uds_dir, "recon_report.sock"))
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=8004)
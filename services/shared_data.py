@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Shared data handles - pass DataFrames between services by parquet reference
+"""
+
+import logging
+import os
+import tempfile
+import time
+import uuid
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # optional; records fall back to the pandas constructor
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+# Directory visible to every co-located service; point this at a shared
+# volume when the services run on separate hosts
+SHARED_DATA_DIR = os.environ.get(
+    "RECON_SHARED_DATA_DIR",
+    os.path.join(tempfile.gettempdir(), "recon_shared_data")
+)
+
+# How long a stored frame may sit before the sweeper deletes it, and how
+# often the opportunistic sweep may run
+SHARED_DATA_TTL = float(os.environ.get("RECON_SHARED_DATA_TTL", "3600"))
+SWEEP_INTERVAL = 60.0
+
+_last_sweep = 0.0
+
+def sweep_stale(max_age: float = SHARED_DATA_TTL) -> int:
+    """Delete stored frames older than max_age; returns the count removed"""
+    removed = 0
+    cutoff = time.time() - max_age
+    try:
+        with os.scandir(SHARED_DATA_DIR) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.parquet'):
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                        removed += 1
+                except OSError:
+                    # Another service may have swept it already
+                    continue
+    except FileNotFoundError:
+        pass
+    if removed:
+        logger.info(f"Swept {removed} stale shared frames")
+    return removed
+
+def _maybe_sweep():
+    """Run the stale sweep at most once per SWEEP_INTERVAL"""
+    global _last_sweep
+    now = time.monotonic()
+    if now - _last_sweep >= SWEEP_INTERVAL:
+        _last_sweep = now
+        sweep_stale()
+
+def store_dataframe(df: pd.DataFrame, prefix: str) -> str:
+    """Persist a DataFrame to the shared directory and return its path"""
+    os.makedirs(SHARED_DATA_DIR, exist_ok=True)
+    _maybe_sweep()
+    path = os.path.join(SHARED_DATA_DIR, f"{prefix}_{uuid.uuid4().hex}.parquet")
+    df.to_parquet(path, index=False)
+    return path
+
+def remove_dataframe(data_ref: str) -> bool:
+    """Delete a stored frame; paths outside the shared dir are ignored"""
+    resolved = os.path.realpath(data_ref)
+    if not resolved.startswith(os.path.realpath(SHARED_DATA_DIR) + os.sep):
+        return False
+    try:
+        os.unlink(resolved)
+        return True
+    except OSError:
+        return False
+
+def load_dataframe(data_ref: str) -> pd.DataFrame:
+    """Load a DataFrame previously stored with store_dataframe"""
+    # Refuse paths outside the shared directory so a crafted data_ref
+    # can't read arbitrary files
+    resolved = os.path.realpath(data_ref)
+    if not resolved.startswith(os.path.realpath(SHARED_DATA_DIR) + os.sep):
+        raise ValueError(f"data_ref outside shared data dir: {data_ref}")
+    return pd.read_parquet(resolved)
+
+# Flag columns that JSON round-trips degrade to object dtype; parquet
+# preserves them as proper bools
+FLAG_COLUMNS = ("PV_Mismatch", "Delta_Mismatch", "Any_Mismatch")
+
+def coerce_flag_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Force mismatch flags back to numpy bool after a JSON round-trip.
+
+    Downstream .sum()/count_nonzero then run over a contiguous bool
+    buffer (SIMD path) instead of object-dtype dispatch. Columns that
+    already arrived as bool (parquet/arrow payloads) are left untouched
+    rather than copied.
+    """
+    for col in FLAG_COLUMNS:
+        if col in df.columns and df[col].dtype != bool:
+            df[col] = df[col].astype(bool)
+    return df
+
+# One-time nudge towards the faster payload forms
+_warned_about_records = False
+
+def resolve_payload(data: dict) -> pd.DataFrame:
+    """Build a DataFrame from a request payload.
+
+    Accepts {"data_ref": <path>} pointing at a stored parquet file,
+    {"columns": {col: [...]}} columnar lists (one array build per column),
+    or the inline {"data": [...]} records form.
+    """
+    global _warned_about_records
+
+    data_ref = data.get("data_ref")
+    if data_ref:
+        return load_dataframe(data_ref)
+
+    columns = data.get("columns")
+    if isinstance(columns, dict) and columns:
+        return coerce_flag_columns(pd.DataFrame(columns))
+
+    records = data.get("data", [])
+    if records and not _warned_about_records:
+        logger.info("Received row-oriented 'data' payload; 'columns' or "
+                    "'data_ref' avoids the per-row construction cost")
+        _warned_about_records = True
+    if pa is not None and records:
+        # Arrow's typed builders columnarize the record list in C++,
+        # far cheaper than pandas' per-row dict inspection
+        try:
+            return coerce_flag_columns(pa.Table.from_pylist(records).to_pandas())
+        except (pa.lib.ArrowInvalid, pa.lib.ArrowTypeError):
+            # Mixed-type columns defeat Arrow's inference; pandas takes
+            # them as object columns like the pre-Arrow path did
+            pass
+    return coerce_flag_columns(pd.DataFrame(records))
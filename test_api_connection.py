@@ -6,6 +6,7 @@ API Connection Test Utility for AI Reconciliation System
 import json
 import sys
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from crew.agents.unified_data_loader import UnifiedDataLoaderAgent
 
 def test_api_connection(config_file=None, base_url=None, api_key=None):
@@ -92,44 +93,31 @@ def test_api_connection(config_file=None, base_url=None, api_key=None):
         print("\n⚠️  Some endpoints are offline. Check your API configuration.")
         return False
     
-    # Test data fetching
+    # Test data fetching; the four endpoints are independent, so probe
+    # them concurrently over the loader's pooled session - total time is
+    # the slowest endpoint instead of the sum of all four
     print("\n📊 Testing Data Fetching...")
-    
-    # Test old pricing
-    print("🔍 Testing old pricing endpoint...")
-    old_pricing = unified_loader._fetch_from_api(unified_loader.endpoints['old_pricing'], trade_ids=['TEST'], date='2024-01-01')
-    if old_pricing is not None:
-        print(f"✅ Old pricing: {len(old_pricing)} records")
-    else:
-        print("❌ Old pricing: Failed to fetch")
-        return False
-    
-    # Test new pricing
-    print("🔍 Testing new pricing endpoint...")
-    new_pricing = unified_loader._fetch_from_api(unified_loader.endpoints['new_pricing'], trade_ids=['TEST'], date='2024-01-01')
-    if new_pricing is not None:
-        print(f"✅ New pricing: {len(new_pricing)} records")
-    else:
-        print("❌ New pricing: Failed to fetch")
-        return False
-    
-    # Test trade metadata
-    print("🔍 Testing trade metadata endpoint...")
-    metadata = unified_loader._fetch_from_api(unified_loader.endpoints['trade_metadata'], trade_ids=['TEST'])
-    if metadata is not None:
-        print(f"✅ Trade metadata: {len(metadata)} records")
-    else:
-        print("❌ Trade metadata: Failed to fetch")
-        return False
-    
-    # Test funding reference
-    print("🔍 Testing funding reference endpoint...")
-    funding = unified_loader._fetch_from_api(unified_loader.endpoints['funding_reference'], trade_ids=['TEST'])
-    if funding is not None:
-        print(f"✅ Funding reference: {len(funding)} records")
-    else:
-        print("❌ Funding reference: Failed to fetch")
-        return False
+
+    fetch_tests = [
+        ("Old pricing", 'old_pricing', {'trade_ids': ['TEST'], 'date': '2024-01-01'}),
+        ("New pricing", 'new_pricing', {'trade_ids': ['TEST'], 'date': '2024-01-01'}),
+        ("Trade metadata", 'trade_metadata', {'trade_ids': ['TEST']}),
+        ("Funding reference", 'funding_reference', {'trade_ids': ['TEST']})
+    ]
+
+    with ThreadPoolExecutor(max_workers=len(fetch_tests)) as pool:
+        futures = [
+            (label, pool.submit(unified_loader._fetch_from_api,
+                                unified_loader.endpoints[endpoint], **kwargs))
+            for label, endpoint, kwargs in fetch_tests
+        ]
+        for label, future in futures:
+            result = future.result()
+            if result is not None:
+                print(f"✅ {label}: {len(result)} records")
+            else:
+                print(f"❌ {label}: Failed to fetch")
+                return False
     
     # Test complete data loading
     print("\n🔄 Testing Complete Data Loading...")
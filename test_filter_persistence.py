@@ -3,9 +3,29 @@
 Test script to verify filter persistence in the dashboard
 """
 
+import numpy as np
 import streamlit as st
 import pandas as pd
 
+@st.cache_data(show_spinner=False)
+def apply_filters(_df: pd.DataFrame, df_hash: int, show_mismatches_only: bool,
+                  product_type: str, diagnosis: str) -> pd.DataFrame:
+    """Apply all filters with one composite mask.
+
+    Memoized per (data hash, filter combo) so reruns with unchanged
+    filters skip the filtering entirely; _df itself is excluded from the
+    cache key (df_hash stands in for it). Building a single boolean mask
+    avoids the chain of successive filtered copies.
+    """
+    mask = np.ones(len(_df), dtype=bool)
+    if show_mismatches_only:
+        mask &= _df['Any_Mismatch'].to_numpy(dtype=bool)
+    if product_type != "All":
+        mask &= (_df['ProductType'] == product_type).to_numpy()
+    if diagnosis != "All":
+        mask &= (_df['Diagnosis'] == diagnosis).to_numpy()
+    return _df[mask]
+
 def test_filter_persistence():
     """Test that filters persist across page refreshes"""
     
@@ -66,14 +86,12 @@ def test_filter_persistence():
         )
         st.session_state.selected_diagnosis = selected_diagnosis
     
-    # Apply filters
-    filtered_data = sample_data.copy()
-    if show_mismatches_only:
-        filtered_data = filtered_data[filtered_data['Any_Mismatch']]
-    if selected_product_type != "All":
-        filtered_data = filtered_data[filtered_data['ProductType'] == selected_product_type]
-    if selected_diagnosis != "All":
-        filtered_data = filtered_data[filtered_data['Diagnosis'] == selected_diagnosis]
+    # Apply filters (cached across reruns with unchanged selections)
+    df_hash = int(pd.util.hash_pandas_object(sample_data, index=False).sum())
+    filtered_data = apply_filters(
+        sample_data, df_hash, show_mismatches_only,
+        selected_product_type, selected_diagnosis
+    )
     
     # Display results
     st.write("### Filtered Results")